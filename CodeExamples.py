@@ -13,13 +13,17 @@ class Candidate:
         self.chromosome = chromosome  # List of integers representing the solution
         self.fitness = fitness
 
-    def calculate_fitness(self, fitness_function):
+    def calculate_fitness(self, fitness_function, cache=None):
         """
         Calculates and updates the fitness value for this candidate.
 
         :param fitness_function: A function that takes a chromosome and returns a fitness value.
+        :param cache: Optional BoundedCache (or any object with get_or_compute) memoising fitness by chromosome.
         """
-        self.fitness = fitness_function(self.chromosome)
+        if cache is None:
+            self.fitness = fitness_function(self.chromosome)
+        else:
+            self.fitness = cache.get_or_compute(tuple(self.chromosome), lambda: fitness_function(self.chromosome))
 
 
 def get_random_population(pop_size=20, gene_size=50):
@@ -39,13 +43,14 @@ def get_random_population(pop_size=20, gene_size=50):
         print(f"Candidate {idx + 1}: Chromosome = {candidate.chromosome[:5]}..., Fitness = {candidate.fitness:.4f}")
 
 
-def hill_climb(candidate, fitness_function, max_iterations=1000):
+def hill_climb(candidate, fitness_function, max_iterations=1000, cache=None):
     """
     Performs Hill Climbing on the given Candidate object.
 
     :param candidate: The initial Candidate object.
     :param fitness_function: A function that evaluates and returns the fitness of a chromosome.
     :param max_iterations: The maximum number of iterations to perform.
+    :param cache: Optional BoundedCache memoising fitness by chromosome, so revisited neighbors are not re-evaluated.
     :return: The best Candidate found.
 
     Explanation:
@@ -61,7 +66,7 @@ def hill_climb(candidate, fitness_function, max_iterations=1000):
             After reaching the maximum iterations, it returns the best candidate found.
     """
     # Evaluate the initial candidate's fitness
-    candidate.calculate_fitness(fitness_function)
+    candidate.calculate_fitness(fitness_function, cache)
 
     for iteration in range(max_iterations):
         # Create a neighbor by modifying one element in the chromosome
@@ -73,7 +78,7 @@ def hill_climb(candidate, fitness_function, max_iterations=1000):
 
         # Create a new candidate from the modified chromosome
         neighbor = Candidate(neighbor_chromosome)
-        neighbor.calculate_fitness(fitness_function)
+        neighbor.calculate_fitness(fitness_function, cache)
 
         # If the neighbor has better fitness, move to the neighbor
         if neighbor.fitness > candidate.fitness:
@@ -98,7 +103,7 @@ def test_HC():
 
 
 def simulated_annealing(candidate, fitness_function, initial_temperature=1000, cooling_rate=0.003,
-                        min_temperature=1e-5):
+                        min_temperature=1e-5, cache=None):
     """
     Performs Simulated Annealing on a given Candidate object.
 
@@ -107,6 +112,7 @@ def simulated_annealing(candidate, fitness_function, initial_temperature=1000, c
     :param initial_temperature: Starting temperature for the annealing process.
     :param cooling_rate: Rate at which the temperature cools (typically a small positive value).
     :param min_temperature: The stopping temperature threshold for the process.
+    :param cache: Optional BoundedCache memoising fitness by chromosome, so revisited neighbors are not re-evaluated.
     :return: The best Candidate found.
 
     Explanation:
@@ -124,7 +130,7 @@ def simulated_annealing(candidate, fitness_function, initial_temperature=1000, c
             The process stops when the temperature falls below min_temperature, returning the best solution found.
     """
     # Calculate the initial candidate's fitness
-    candidate.calculate_fitness(fitness_function)
+    candidate.calculate_fitness(fitness_function, cache)
     current_temperature = initial_temperature
 
     # Keep track of the best solution found
@@ -140,7 +146,7 @@ def simulated_annealing(candidate, fitness_function, initial_temperature=1000, c
 
         # Create a new Candidate from the modified chromosome
         neighbor = Candidate(neighbor_chromosome)
-        neighbor.calculate_fitness(fitness_function)
+        neighbor.calculate_fitness(fitness_function, cache)
 
         # Calculate the difference in fitness
         fitness_diff = neighbor.fitness - candidate.fitness
@@ -175,7 +181,8 @@ def test_SA():
     print(f"Best Fitness: {best_candidate.fitness}")
 
 
-def tabu_search(initial_candidate, fitness_function, tabu_list_size=10, max_iterations=100, neighborhood_size=10):
+def tabu_search(initial_candidate, fitness_function, tabu_list_size=10, max_iterations=100, neighborhood_size=10,
+                cache=None):
     """
     Performs Tabu Search on a given Candidate object.
 
@@ -184,6 +191,7 @@ def tabu_search(initial_candidate, fitness_function, tabu_list_size=10, max_iter
     :param tabu_list_size: The maximum size of the Tabu List.
     :param max_iterations: The maximum number of iterations to perform.
     :param neighborhood_size: The number of neighbors to explore in each iteration.
+    :param cache: Optional BoundedCache memoising fitness by chromosome, so revisited neighbors are not re-evaluated.
     :return: The best Candidate found.
 
     Explanation:
@@ -205,7 +213,7 @@ def tabu_search(initial_candidate, fitness_function, tabu_list_size=10, max_iter
             The search stops after a given number of iterations (max_iterations), and the best candidate found is returned.
     """
     # Calculate the fitness of the initial candidate
-    initial_candidate.calculate_fitness(fitness_function)
+    initial_candidate.calculate_fitness(fitness_function, cache)
 
     # Initialize the current candidate and best candidate as the initial candidate
     current_candidate = initial_candidate
@@ -229,7 +237,7 @@ def tabu_search(initial_candidate, fitness_function, tabu_list_size=10, max_iter
 
             # Create a new candidate from the modified chromosome
             neighbor = Candidate(neighbor_chromosome)
-            neighbor.calculate_fitness(fitness_function)
+            neighbor.calculate_fitness(fitness_function, cache)
 
             # Add the neighbor to the neighborhood
             neighborhood.append(neighbor)
@@ -1,10 +1,17 @@
 import random
 import tkinter as tk
 import numpy as np
-from multiprocessing import Pool, cpu_count
 import logging
+from tkinter import filedialog
 from tkinter.simpledialog import askinteger
 import time
+import queue
+import threading
+
+import tsplib
+from tsp_core import (ACO, ExactSolver, GeneticAlgorithm, IslandModel, LinKernighan, NeighbourIndex, SolveControl,
+                      crossover_names, distance_matrix, exact_limit, instance_bound, instance_distances,
+                      nearest_neighbours, pheromone_rules)
 
 logging.basicConfig(level=logging.INFO)
 
@@ -12,11 +19,17 @@ num_cities = 25
 city_scale = 5
 road_width = 4
 padding = 100
-num_ants = 30
-alpha = 1  # Importance of pheromone
-beta = 2   # Importance of heuristic
-evaporation_rate = 0.5 # Rate of pheromone evaporation
-iterations = 100
+parallel_threshold = 200 # Above this many cities the colony is built on the shared worker pool
+max_cities = 5000
+max_drawn_roads = 100 # Above this many cities only candidate roads are drawn, not all N(N-1)/2
+frame_rate = 30 # Progress redraws per second at most; solver updates in between are skipped
+poll_interval = 1000 // frame_rate # Milliseconds between drains of the progress queue
+max_overlay_edges = 2000 # Most frequent roads shown in the ants' / population's edge-frequency layer
+lk_time_limit = 10 # Seconds of chained Lin-Kernighan for Run TSP LK
+max_iterations = 1000 # ACO iterations / GA generations at most; the stop conditions below usually end runs sooner
+time_budget = 60 # Seconds an ACO / GA run may take
+stagnation_window = 50 # ACO / GA stop after this many iterations without a shorter tour
+polish_time = 3 # Seconds of Lin-Kernighan applied to the ACO / GA result when LK Polish is ticked
 
 class Node:
     def __init__(self, x, y):
@@ -27,89 +40,62 @@ class Node:
         canvas.create_oval(self.x - city_scale, self.y - city_scale,
                            self.x + city_scale, self.y + city_scale, fill=color)
 
-class ACO:
-    def __init__(self, distance_matrix, num_ants, alpha, beta, evaporation_rate, iterations):
-        # Initialize ACO parameters and pheromone matrix
-        self.distance_matrix = distance_matrix
-        self.num_cities = len(distance_matrix)
-        self.num_ants = num_ants
-        self.alpha = alpha
-        self.beta = beta
-        self.evaporation_rate = evaporation_rate
-        self.iterations = iterations
-        self.pheromones = np.ones((self.num_cities, self.num_cities))
-
-    def probability(self, current_city, unvisited):
-        # Calculate the probability of moving to each unvisited city
-        unvisited = list(unvisited)
-        pheromones = np.array([self.pheromones[current_city, i] for i in unvisited])
-        distances = np.array([self.distance_matrix[current_city, i] for i in unvisited])
-        heuristic = 1 / distances # Inverse distance
-        denom = np.sum((pheromones ** self.alpha) * (heuristic ** self.beta))
-        probs = (pheromones ** self.alpha) * (heuristic ** self.beta) / denom
-        return probs.tolist()
-
-    def simulate_ant(self, seed):
-        # Simulate a single ant's tour and return the roads tested
-        random.seed(seed)
-        tour = [random.randint(0, self.num_cities - 1)] # Start from a random city
-        unvisited = set(range(self.num_cities)) - {tour[0]}
-        tested_roads = []  # Collect roads tested by the ant
-
-        while unvisited:
-            current_city = tour[-1]
-            probs = self.probability(current_city, unvisited) # Probabilities for next city
-            next_city = random.choices(list(unvisited), weights=probs, k=1)[0]
-            tour.append(next_city)
-            unvisited.remove(next_city)
-
-            # Record the road being tested
-            tested_roads.append((current_city, next_city))
-
-        return tour, self.total_distance(tour), tested_roads
-
-    def update_pheromones(self, best_tour, best_distance):
-        # Update the pheromone levels based on the best tour
-        self.pheromones *= (1 - self.evaporation_rate) # Evaporate pheromones
-        for i in range(len(best_tour)):
-            start_city = best_tour[i]
-            end_city = best_tour[(i + 1) % len(best_tour)]
-            self.pheromones[start_city][end_city] += 1.0 / best_distance # Reinforce best path
-
-    def total_distance(self, tour):
-        #Calculate the total distance of a given tour
-        return sum(self.distance_matrix[tour[i], tour[(i + 1) % self.num_cities]] for i in range(len(tour)))
-
-    def run(self, canvas, cities_list, visualize = True):
-        best_tour = None
-        best_distance = float("inf")
-        all_tested_roads = []  # Initialize to store tested roads
-
-        with Pool(cpu_count()) as pool:
-            for iteration in range(self.iterations):
-                seeds = [random.randint(0, 10000) for _ in range(self.num_ants)]
-                results = pool.map(self.simulate_ant, seeds)
-
-                if visualize and iteration % 10 == 0:  # Only visualize every 10 iterations
-                    canvas.delete("aco_paths")
-                    for tour, _, _ in results:
-                        for i in range(len(tour)):
-                            start = cities_list[tour[i]]
-                            end = cities_list[tour[(i + 1) % len(tour)]]
-                            canvas.create_line(
-                                start.x, start.y, end.x, end.y, fill="lightgreen", dash=(4, 2), tags="aco_paths"
-                            )
-                    canvas.update()
-
-                for tour, tour_distance, tested_roads in results:
-                    all_tested_roads.extend(tested_roads)
-                    if tour_distance < best_distance:
-                        best_distance = tour_distance
-                        best_tour = tour
-
-                self.update_pheromones(best_tour, best_distance)
-
-            return best_tour, best_distance, all_tested_roads
+class TourRenderer:
+    """Retained-mode drawing of tours: canvas items are created once per layer and then only moved."""
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.points = np.zeros((0, 2))
+        self.routes = {} # tag -> polyline item for a whole tour
+        self.edges = {} # tag -> pool of line items for an edge-frequency layer
+        self.last_frame = 0.0
+
+    def reset(self, points):
+        # New map: the canvas was cleared, so forget every item
+        self.points = np.asarray(points, dtype=np.float64)
+        self.routes.clear()
+        self.edges.clear()
+        self.last_frame = 0.0
+
+    def frame_due(self):
+        # True at most frame_rate times a second, so progress callbacks never outpace Tk
+        now = time.perf_counter()
+        if now - self.last_frame < 1.0 / frame_rate:
+            return False
+        self.last_frame = now
+        return True
+
+    def route(self, tag, tour, **options):
+        # One closed polyline per tour instead of one line item per road
+        flat = self.points[np.append(tour, tour[0])].ravel().tolist()
+        item = self.routes.get(tag)
+        if item is None:
+            self.routes[tag] = self.canvas.create_line(*flat, tags=tag, **options)
+        else:
+            self.canvas.coords(item, flat)
+            self.canvas.itemconfig(item, state="normal", **options)
+
+    def edge_frequencies(self, tag, tours, fill):
+        # All tours collapsed into one layer: each road drawn once, thicker the more tours use it
+        tours = np.asarray(tours)
+        if tours.size == 0:
+            return
+        n = len(self.points)
+        a, b = tours.ravel(), np.roll(tours, -1, axis=1).ravel()
+        keys, counts = np.unique(np.minimum(a, b).astype(np.int64) * n + np.maximum(a, b), return_counts=True)
+        if len(keys) > max_overlay_edges:
+            top = np.argpartition(counts, -max_overlay_edges)[-max_overlay_edges:]
+            keys, counts = keys[top], counts[top]
+        widths = 1 + np.rint(3 * counts / len(tours)).astype(int)
+        segments = np.hstack([self.points[keys // n], self.points[keys % n]]).tolist()
+
+        pool = self.edges.setdefault(tag, [])
+        while len(pool) < len(segments):
+            pool.append(self.canvas.create_line(0, 0, 0, 0, fill=fill, dash=(4, 2), tags=tag))
+        for item, segment, width in zip(pool, segments, widths.tolist()):
+            self.canvas.coords(item, segment)
+            self.canvas.itemconfig(item, width=width, state="normal")
+        for item in pool[len(segments):]:
+            self.canvas.itemconfig(item, state="hidden")
 
 class TravelingSalesmanUI(tk.Tk):
     def __init__(self):
@@ -127,25 +113,56 @@ class TravelingSalesmanUI(tk.Tk):
         self.city_entry.pack(side=tk.LEFT, padx=5, pady=5)
 
         tk.Button(self.toolbar, text="Update", command=self.update_cities).pack(side=tk.LEFT, padx=5, pady=5)
+        tk.Button(self.toolbar, text="Load TSPLIB", command=self.load_tsplib).pack(side=tk.LEFT, padx=5, pady=5)
+        tk.Button(self.toolbar, text="Save TSPLIB", command=self.save_tsplib).pack(side=tk.LEFT, padx=5, pady=5)
         tk.Button(self.toolbar, text="Run TSP ACO", command=self.run_tsp_aco).pack(side=tk.LEFT, padx=5, pady=5)
         tk.Button(self.toolbar, text="Run TSP No ACO", command=self.run_tsp_no_aco).pack(side=tk.LEFT, padx=5, pady=5)
+        tk.Button(self.toolbar, text="Run TSP Exact", command=self.run_tsp_exact).pack(side=tk.LEFT, padx=5, pady=5)
+        tk.Button(self.toolbar, text="Run TSP LK", command=self.run_tsp_lk).pack(side=tk.LEFT, padx=5, pady=5)
         tk.Button(self.toolbar, text="Run Comparison", command=self.run_comparison).pack(side=tk.LEFT, padx=5, pady=5)
+        self.pause_button = tk.Button(self.toolbar, text="Pause", command=self.toggle_pause)
+        self.pause_button.pack(side=tk.LEFT, padx=5, pady=5)
+        tk.Button(self.toolbar, text="Cancel", command=self.cancel_solve).pack(side=tk.LEFT, padx=5, pady=5)
+
+        tk.Label(self.toolbar, text="Pheromone Rule:", bg="gray", fg="white").pack(side=tk.LEFT, padx=5, pady=5)
+        self.rule_var = tk.StringVar(value="AS")
+        tk.OptionMenu(self.toolbar, self.rule_var, *pheromone_rules).pack(side=tk.LEFT, padx=5, pady=5)
+
+        tk.Label(self.toolbar, text="Crossover:", bg="gray", fg="white").pack(side=tk.LEFT, padx=5, pady=5)
+        self.crossover_var = tk.StringVar(value="OX")
+        tk.OptionMenu(self.toolbar, self.crossover_var, *crossover_names).pack(side=tk.LEFT, padx=5, pady=5)
+        self.islands_var = tk.BooleanVar(value=False) # GA as one population per core, see IslandModel
+        tk.Checkbutton(self.toolbar, text="Islands", variable=self.islands_var).pack(side=tk.LEFT, padx=5, pady=5)
+        self.polish_var = tk.BooleanVar(value=False) # Finish ACO / GA tours with a short Lin-Kernighan run
+        tk.Checkbutton(self.toolbar, text="LK Polish", variable=self.polish_var).pack(side=tk.LEFT, padx=5, pady=5)
+        tk.Label(self.toolbar, text="Stop Gap %:", bg="gray", fg="white").pack(side=tk.LEFT, padx=5, pady=5)
+        self.gap_entry = tk.Entry(self.toolbar, width=5) # ACO / GA stop this close to the lower bound; empty = never
+        self.gap_entry.pack(side=tk.LEFT, padx=5, pady=5)
 
         self.canvas = tk.Canvas(self, bg="white")
         self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.renderer = TourRenderer(self.canvas)
 
         self.cities_list = []
         self.num_cities = 25
+        self.problem = None # TSPLIB instance currently on the map, if one was loaded
+        self.optimum = None # Its known optimal length
+        self.lower_bound = None # Held-Karp bound of the map, computed by its first solve
+
+        self.control = None # SolveControl of the running solve
+        self.solve_thread = None
+        self.progress_queue = queue.Queue() # Progress and results from the solve thread
+        self.comparing = False
 
     def update_cities(self):
         # Update the number of cities and regenerate the map
         try:
             num = int(self.city_entry.get())
-            if 5 <= num <= 100:
+            if 5 <= num <= max_cities:
                 self.num_cities = num
                 self.generate_cities()
             else:
-                tk.messagebox.showerror("Error", "Please enter a number between 5 and 100.")
+                tk.messagebox.showerror("Error", f"Please enter a number between 5 and {max_cities}.")
         except ValueError:
             tk.messagebox.showerror("Error", "Invalid input. Please enter a number.")
 
@@ -156,160 +173,288 @@ class TravelingSalesmanUI(tk.Tk):
                             for _ in range(self.num_cities)]
 
         self.distance_matrix = self.calculate_distance_matrix()
+        self.neighbour_index = NeighbourIndex([[node.x, node.y] for node in self.cities_list])
+        self.candidates = self.neighbour_index.neighbours
+        self.problem = None
+        self.optimum = None
+        self.draw_map()
+
+    def load_tsplib(self):
+        # Replace the map with a TSPLIB instance, scaled to fit the canvas; solvers use its own distances
+        path = filedialog.askopenfilename(filetypes=[("TSPLIB instances", "*.tsp"), ("All files", "*")])
+        if not path:
+            return
+        try:
+            problem = tsplib.read_tsplib(path)
+        except (OSError, ValueError, KeyError) as e:
+            tk.messagebox.showerror("Error", f"Could not read {path}: {e}")
+            return
+        if problem.coordinates is None:
+            tk.messagebox.showerror("Error", f"{problem.name} has no coordinates to display.")
+            return
+        if not 5 <= problem.dimension <= max_cities:
+            tk.messagebox.showerror("Error", f"{problem.name} has {problem.dimension} cities; "
+                                             f"the map supports 5 to {max_cities}.")
+            return
 
+        points = np.array(problem.coordinates, dtype=np.float64)
+        if problem.edge_weight_type == "GEO": # (latitude, longitude) -> (x east, y south)
+            points = np.column_stack([points[:, 1], -points[:, 0]])
+        else: # TSPLIB y grows upward, the canvas's grows downward
+            points[:, 1] = -points[:, 1]
+        width, height = self.winfo_width() - 100, self.winfo_height() - 100
+        span = np.maximum(points.max(axis=0) - points.min(axis=0), 1e-9)
+        scale = min(width / span[0], height / span[1])
+        points = 50 + (points - points.min(axis=0)) * scale
+
+        self.cities_list = [Node(x, y) for x, y in points]
+        self.num_cities = problem.dimension
+        self.distance_matrix = instance_distances(problem)
+        self.candidates = nearest_neighbours(self.distance_matrix)
+        self.problem = problem
+        self.optimum = problem.optimum
+        self.draw_map()
+        logging.info(f"Loaded {problem.name}: {problem.dimension} cities, {problem.edge_weight_type}, "
+                     f"optimum {problem.optimum}")
+
+    def save_tsplib(self):
+        # Save the current map so later runs can be compared on the same instance
+        if not self.cities_list:
+            tk.messagebox.showwarning("Warning", "Please generate cities first.")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".tsp", filetypes=[("TSPLIB instances", "*.tsp")])
+        if not path:
+            return
+        if self.problem is not None and self.problem.edge_weight_type in tsplib.coordinate_types:
+            # Keep the instance's own coordinates and distance function, not the scaled map
+            tsplib.write_tsplib(path, self.problem.coordinates, self.problem.name, self.problem.comment,
+                                self.problem.edge_weight_type)
+        else:
+            tsplib.write_tsplib(path, [[node.x, node.y] for node in self.cities_list],
+                                name=f"random{len(self.cities_list)}")
+
+    def draw_map(self):
+        if self.control is not None: # A run on the old map is abandoned
+            self.control.cancel()
+            self.control = None
+        self.lower_bound = None
         self.canvas.delete("all")
-        for i in range(len(self.cities_list)):
-            for j in range(i + 1, len(self.cities_list)):
-                start_node = self.cities_list[i]
-                end_node = self.cities_list[j]
-                self.canvas.create_line(
-                    start_node.x, start_node.y, end_node.x, end_node.y, fill='lightgray', dash=(4, 2), tags="all_roads"
-                )
+        self.renderer.reset([[node.x, node.y] for node in self.cities_list])
+        for i, j in self.drawn_roads():
+            start_node = self.cities_list[i]
+            end_node = self.cities_list[j]
+            self.canvas.create_line(
+                start_node.x, start_node.y, end_node.x, end_node.y, fill='lightgray', dash=(4, 2), tags="all_roads"
+            )
         for node in self.cities_list:
             node.draw(self.canvas) # Draw cities on top of the roads
 
-    def calculate_distance_matrix(self):
-        coordinates = np.array([[node.x, node.y] for node in self.cities_list])
-        return np.sqrt(np.sum((coordinates[:, None, :] - coordinates[None, :, :]) ** 2, axis=2))
+    def drawn_roads(self):
+        # Every road on small maps; on large ones only the candidate roads the solvers actually consider
+        n = len(self.cities_list)
+        if n <= max_drawn_roads:
+            return [(i, j) for i in range(n) for j in range(i + 1, n)]
+        return sorted({(min(i, int(j)), max(i, int(j))) for i in range(n) for j in self.candidates[i]})
 
-    def run_tsp_aco(self):
-        # Run TSP using ACO
-        if not self.cities_list:
-            tk.messagebox.showwarning("Warning", "Please generate cities first.")
-            return
+    def calculate_distance_matrix(self):
+        return distance_matrix([[node.x, node.y] for node in self.cities_list])
 
-        # Initialize ACO
-        aco = ACO(self.distance_matrix, num_ants=50, alpha=1, beta=2, evaporation_rate=0.5, iterations=100)
+    def run_tsp_aco(self, local_search=False):
+        # Run TSP using ACO, optionally polishing each iteration's best ant with local search
+        self.start_solves(["ACO+LS" if local_search else "ACO"])
 
-        # Time the execution
-        start_time = time.time()
-        best_tour, best_distance, _ = aco.run(self.canvas, self.cities_list)
-        execution_time = time.time() - start_time
+    def run_tsp_no_aco(self, local_search=False):
+        # Run TSP using GA, optionally polishing every child with local search
+        self.start_solves(["GA+LS" if local_search else "GA"])
 
-        # Draw ACO route
-        self.canvas.delete("aco_route")
-        for i in range(len(best_tour)):
-            start = self.cities_list[best_tour[i]]
-            end = self.cities_list[best_tour[(i + 1) % len(best_tour)]]
-            self.canvas.create_line(
-                start.x, start.y, end.x, end.y, fill='lightgreen', width=4, tags="aco_route"
-            )
-
-        self.display_results("ACO", best_distance, execution_time, completed=True, tags="aco_text")
-        logging.info(f"ACO completed in {execution_time:.2f}s")
+    def run_tsp_exact(self):
+        # Optimal tour by dynamic programming; it also becomes the optimum the other results are measured against
+        if len(self.cities_list) > exact_limit:
+            tk.messagebox.showwarning("Warning", f"The exact solver handles at most {exact_limit} cities.")
+            return
+        self.start_solves(["Exact"])
+
+    def run_tsp_lk(self):
+        # Run chained Lin-Kernighan from a nearest-neighbour tour
+        self.start_solves(["LK"])
+
+    def make_solver(self, method, control):
+        # Build the solver for a method on the Tk thread; it then runs on the worker thread
+        local_search = method.endswith("+LS")
+        polish = polish_time if self.polish_var.get() else None
+        # Stop conditions; a known optimum (TSPLIB or Run TSP Exact) is a target distance, as nothing beats it
+        stops = {"lower_bound": self.lower_bound, "target_gap": self.target_gap(), "time_limit": time_budget,
+                 "target_distance": self.optimum, "stagnation": stagnation_window}
+        if method == "Exact":
+            return ExactSolver(self.distance_matrix, control=control)
+        if method == "LK":
+            return LinKernighan(self.distance_matrix, self.candidates, time_limit=lk_time_limit, control=control)
+        if method.startswith("ACO"):
+            return ACO(self.distance_matrix, num_ants=50, alpha=1, beta=2, evaporation_rate=0.5,
+                       iterations=max_iterations, parallel=len(self.cities_list) >= parallel_threshold,
+                       candidates=self.candidates, local_search=local_search, pheromone_rule=self.rule_var.get(),
+                       control=control, polish_time=polish, **stops)
+        if self.islands_var.get():
+            return IslandModel(self.distance_matrix, self.candidates, generations=max_iterations,
+                               local_search=local_search, control=control, crossover=self.crossover_var.get(),
+                               polish_time=polish, **stops)
+        return GeneticAlgorithm(self.distance_matrix, self.candidates, generations=max_iterations,
+                                local_search=local_search, control=control, crossover=self.crossover_var.get(),
+                                polish_time=polish, **stops)
+
+    def target_gap(self):
+        # Early-stop threshold from the toolbar, in percent above the lower bound; None when left empty
+        try:
+            return float(self.gap_entry.get())
+        except ValueError:
+            return None
 
-    def run_tsp_no_aco(self):
-        # Run TSP using GA
+    def start_solves(self, methods):
+        # Run the methods one after another on a background thread; progress comes back through a queue.
+        #   Returns whether the run started
         if not self.cities_list:
             tk.messagebox.showwarning("Warning", "Please generate cities first.")
-            return
+            return False
+        if self.solve_thread is not None and self.solve_thread.is_alive():
+            tk.messagebox.showwarning("Warning", "A solve is already running; cancel it first.")
+            return False
+
+        self.control = SolveControl()
+        self.comparing = False
+        solvers = [(method, self.make_solver(method, self.control)) for method in methods]
+        self.solve_thread = threading.Thread(target=self.solve_worker, args=(solvers, self.control, self.lower_bound),
+                                             daemon=True)
+        self.solve_thread.start()
+        self.pause_button.config(text="Pause")
+        self.after(poll_interval, self.drain_progress)
+        return True
+
+    def solve_worker(self, solvers, control, lower_bound):
+        # Worker thread: never touches Tk, only the queue; messages carry their run's control so the Tk side
+        #   can drop those of a run that was abandoned for a new map
+        if lower_bound is None: # First solve on this map: bound it once, the Tk side keeps it for later runs
+            lower_bound = instance_bound(self.distance_matrix, self.candidates, control=control)
+            self.progress_queue.put((control, "bound", None, lower_bound))
+            for method, solver in solvers:
+                if hasattr(solver, "lower_bound"):
+                    solver.lower_bound = lower_bound
+        results = {}
+        for method, solver in solvers:
+            def report(progress, method=method):
+                self.progress_queue.put((control, "progress", method, progress))
+
+            best_tour, best_distance = solver.run(report)[:2]
+            results[method] = (best_distance, solver.elapsed())
+            self.progress_queue.put((control, "done", method,
+                                     (best_tour, best_distance, solver.elapsed(), solver.stop_reason)))
+            if control.cancelled.is_set():
+                break
+        self.progress_queue.put((control, "finished", None, results))
+
+    def drain_progress(self):
+        # Tk thread: apply everything the worker queued since the last poll, drawing only the newest progress
+        latest = {}
+        while True:
+            try:
+                control, kind, method, payload = self.progress_queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "finished" and control is not self.control:
+                return # This loop belonged to an abandoned run
+            if control is not self.control:
+                continue
+            if kind == "progress":
+                latest[method] = payload
+            elif kind == "bound":
+                self.lower_bound = payload
+            elif kind == "done":
+                latest.pop(method, None)
+                self.finish_solve(method, *payload)
+            else:
+                self.finish_solves(payload)
+                return
+
+        for method, progress in latest.items():
+            if method.startswith("ACO"):
+                self.draw_aco_progress(progress)
+            elif method == "LK":
+                self.draw_lk_progress(progress)
+            else:
+                self.draw_ga_progress(progress)
+            self.display_results(method, progress.best_distance, progress.elapsed,
+                                 tags=method.lower().replace("+", "_") + "_text")
+        self.after(poll_interval, self.drain_progress)
 
-        start_time = time.time()
-        best_solution, best_distance = self.run_genetic_algorithm()
-        execution_time = time.time() - start_time
+    def finish_solve(self, method, best_tour, best_distance, execution_time, stop_reason):
+        if best_tour is None: # Cancelled before the first iteration finished
+            return
+        if method.startswith("ACO"):
+            self.renderer.route("aco_route", best_tour, fill='lightgreen', width=4) # Draw ACO route
+        elif method == "LK":
+            self.renderer.route("lk_route", best_tour, fill="purple", width=4) # Draw LK route
+        elif method == "Exact":
+            self.renderer.route("exact_route", best_tour, fill="red", width=2) # Thin, so other routes show under it
+            self.optimum = best_distance # Exact, so the other results' gaps are now to the optimum
+        else:
+            self.renderer.route("ga_best", best_tour, fill="orange", width=4) # Final visualization for the best
+            self.renderer.route("ga_route", best_tour, fill='orange', width=4) # draw GA route
+
+        completed = not self.control.cancelled.is_set()
+        tags = method.lower().replace("+", "_") + "_text"
+        self.display_results(method, best_distance, execution_time, completed=completed, tags=tags,
+                             stop_reason=stop_reason)
+        logging.info(f"{method} stopped on {stop_reason} after {execution_time:.2f}s")
+
+    def finish_solves(self, results):
+        if self.comparing and len(results) == 4:
+            self.report_comparison(results)
+        self.comparing = False
+
+    def toggle_pause(self):
+        if self.control is None or not self.solve_thread.is_alive():
+            return
+        if self.control.paused():
+            self.control.resume()
+            self.pause_button.config(text="Pause")
+        else:
+            self.control.pause()
+            self.pause_button.config(text="Resume")
+
+    def cancel_solve(self):
+        if self.control is not None:
+            self.control.cancel()
+            self.pause_button.config(text="Pause")
+
+    def draw_aco_progress(self, progress):
+        # Overlay how often the ants used each road, at most frame_rate times a second
+        if not self.renderer.frame_due():
+            return
+        self.renderer.edge_frequencies("aco_paths", progress.tours, "lightgreen")
 
-        self.canvas.delete("ga_route") # draw GA route
-        for i in range(len(best_solution)):
-            start = self.cities_list[best_solution[i]]
-            end = self.cities_list[best_solution[(i + 1) % len(best_solution)]]
-            self.canvas.create_line(
-                start.x, start.y, end.x, end.y, fill='orange', width=4, tags="ga_route"
-            )
+    def draw_lk_progress(self, progress):
+        # LK has a single tour, so there is no overlay; just follow the best route
+        if not self.renderer.frame_due():
+            return
+        self.renderer.route("lk_route", progress.best_tour, fill="purple", width=2)
 
-        self.display_results("GA", best_distance, execution_time, completed=True, tags="ga_text")
-        logging.info(f"GA completed in {execution_time:.2f}s")
-
-    def run_genetic_algorithm(self, visualize=True, update_interval=10):
-        # TSP GA
-        population = [random.sample(range(len(self.cities_list)), len(self.cities_list)) for _ in range(30)]
-        best_solution = None
-        best_distance = float("inf")
-
-        for generation in range(100):  # Generations
-            # Evolve the population
-            population = self.evolve_population(population)
-
-            # Find the best solution in the current generation
-            current_best = min(population, key=self.total_distance)
-            current_distance = self.total_distance(current_best)
-
-            # Update global best if a new best is found
-            if current_distance < best_distance:
-                best_solution = current_best
-                best_distance = current_distance
-
-            # Visualize the current population and best route every `update_interval` generations
-            if visualize and generation % update_interval == 0:
-                self.canvas.delete("ga_paths")
-                for tour in population:
-                    for i in range(len(tour)):
-                        start = self.cities_list[tour[i]]
-                        end = self.cities_list[tour[(i + 1) % len(tour)]]
-                        self.canvas.create_line(
-                            start.x, start.y, end.x, end.y, fill="orange", dash=(4, 2), tags="ga_paths"
-                        )
-
-                # Highlight the current best route
-                self.canvas.delete("ga_best")
-                for i in range(len(best_solution)):
-                    start = self.cities_list[best_solution[i]]
-                    end = self.cities_list[best_solution[(i + 1) % len(best_solution)]]
-                    self.canvas.create_line(
-                        start.x, start.y, end.x, end.y, fill="orange", width=2, tags="ga_best"
-                    )
-
-                # Update the canvas
-                self.canvas.update()
-
-        # Final visualization for the best solution
-        self.canvas.delete("ga_best")
-        for i in range(len(best_solution)):
-            start = self.cities_list[best_solution[i]]
-            end = self.cities_list[best_solution[(i + 1) % len(best_solution)]]
-            self.canvas.create_line(
-                start.x, start.y, end.x, end.y, fill="orange", width=4, tags="ga_best"
-            )
+    def draw_ga_progress(self, progress):
+        # Visualize the current population's roads and best route
+        if not self.renderer.frame_due():
+            return
+        self.renderer.edge_frequencies("ga_paths", progress.tours, "orange")
+        self.renderer.route("ga_best", progress.best_tour, fill="orange", width=2) # Highlight the current best
 
-        return best_solution, best_distance
-
-    def total_distance(self, tour):
-        # Calculate the total distance of a tour
-        return sum(self.distance_matrix[tour[i], tour[(i + 1) % len(tour)]] for i in range(len(tour)))
-
-    def evolve_population(self, population):
-        # Evolve the population
-        def crossover(parent1, parent2):
-            child = [None] * len(parent1)
-            start, end = sorted(random.sample(range(len(parent1)), 2))
-            child[start:end] = parent1[start:end]
-            for gene in parent2:
-                if gene not in child:
-                    child[child.index(None)] = gene
-            return child
-
-        def mutate(tour):
-            if random.random() < 0.01:
-                i, j = random.sample(range(len(tour)), 2)
-                tour[i], tour[j] = tour[j], tour[i]
-
-        selected = sorted(population, key=self.total_distance)[:10]
-        next_population = []
-
-        while len(next_population) < len(population):
-            parent1, parent2 = random.sample(selected, 2)
-            child = crossover(parent1, parent2)
-            mutate(child)
-            next_population.append(child)
-
-        return next_population
-
-    def display_results(self, method, distance, time_taken, completed=False, tags=None):
-        self.canvas.delete(tags)
+    def display_results(self, method, distance, time_taken, completed=False, tags=None, stop_reason=None):
+        self.canvas.delete(tags, f"{tags}_bg")
         
-        y_offset = {"ACO": 10, "GA": 50}[method]
+        y_offset = {"ACO": 10, "GA": 50, "ACO+LS": 90, "GA+LS": 130, "LK": 170, "Exact": 210}[method]
         text = f"{method} - Best Distance: {distance:.2f}, Time: {time_taken:.2f}s"
+        if self.optimum:
+            text += f", Gap: {tsplib.gap(distance, self.optimum):.2f}%"
+        if self.lower_bound:
+            text += f", Gap to Bound: {tsplib.gap(distance, self.lower_bound):.2f}%"
         if completed:
-            text += " (Completed)"
+            text += f" (Completed: {stop_reason})" if stop_reason else " (Completed)"
         
         text_id = self.canvas.create_text(
             10, y_offset, text=text, anchor="nw", tags=tags, fill="black", font=("Arial", 12)
@@ -324,21 +469,21 @@ class TravelingSalesmanUI(tk.Tk):
             self.canvas.tag_raise(text_id)
     
     def run_comparison(self):
-        # Run both TSP algorithms sequentially for comparison
-        
-        # Run ACO
-        start_time_aco = time.time()
-        self.run_tsp_aco()
-        time_taken_aco = time.time() - start_time_aco
-        
-        # Run GA
-        start_time_ga = time.time()
-        self.run_tsp_no_aco()
-        time_taken_ga = time.time() - start_time_ga
-
-        # Log the time comparison
-        logging.info(f"ACO Execution Time: {time_taken_aco:.2f}s")
-        logging.info(f"GA Execution Time: {time_taken_ga:.2f}s")
+        # Run both TSP algorithms sequentially for comparison, each with and without local search
+        # The results are drained on this thread, so setting the flag after the start cannot miss them; a refused
+        #   start leaves the running solve's flag alone
+        if self.start_solves(["ACO", "GA", "ACO+LS", "GA+LS"]):
+            self.comparing = True
+
+    def report_comparison(self, results):
+        # Log the time comparison and the tour quality reached per second of solving
+        for method, (distance, time_taken) in results.items():
+            logging.info(f"{method} Execution Time: {time_taken:.2f}s, Best Distance: {distance:.2f}, "
+                         f"Distance x Time: {distance * time_taken:.1f}")
+        for method in ("ACO", "GA"):
+            (plain, plain_time), (polished, polished_time) = results[method], results[f"{method}+LS"]
+            logging.info(f"{method} local search: {100 * (plain - polished) / plain:.1f}% shorter tour "
+                         f"in {polished_time / max(plain_time, 1e-9):.2f}x the time")
 
         #tk.messagebox.showinfo(
         #    "Comparison Results",
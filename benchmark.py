@@ -0,0 +1,170 @@
+"""Headless, reproducible benchmark of the TSP solvers.
+
+Sweeps city counts (or TSPLIB files), seeds, solvers and solver parameters with nothing drawn, and records
+wall time, iterations per second, best length and the gap to the best known length of each instance. Rows
+go to CSV and/or JSON; given a baseline JSON from an earlier run, every configuration whose mean time or
+mean length got worse by more than the tolerances is flagged and the exit status is 1:
+
+    python benchmark.py --cities 50 200 --solver aco ga --param pheromone_rule=AS,MMAS --json base.json
+    python benchmark.py --cities 50 200 --solver aco ga --param pheromone_rule=AS,MMAS --baseline base.json
+"""
+import argparse
+import csv
+import itertools
+import json
+import logging
+import random
+import sys
+
+import numpy as np
+
+import tsplib
+from tsp_core import batch_instances, exact_limit, iterations, oversized_for_exact, positive, solve
+
+# solve() keyword arguments a sweep can vary, with how to read their values from the command line
+sweep_parameters = {
+    "iterations": int, "time_limit": float, "local_search": lambda value: value.lower() in ("1", "true", "yes"),
+    "pheromone_rule": str, "crossover": str, "islands": int, "polish_time": float, "stagnation": int,
+    "target_gap": float,
+}
+time_tolerance = 0.25 # Flag a configuration that got this much slower than the baseline...
+quality_tolerance = 0.01 # ...or whose tours got this much longer
+time_slack = 0.1 # Seconds of slowdown always tolerated, as very short runs are mostly timer noise
+columns = ("instance", "cities", "seed", "solver", "params", "options", "time", "iterations", "iterations_per_second",
+           "best_distance", "best_known", "gap", "stop_reason")
+
+def parse_grid(specs):
+    # ["pheromone_rule=AS,MMAS", "local_search=0,1"] -> every combination as a solve() keyword dict
+    axes = []
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if name not in sweep_parameters or not values:
+            raise ValueError(f"Cannot sweep {spec!r}; parameters are {', '.join(sweep_parameters)}")
+        axes.append([(name, sweep_parameters[name](value)) for value in values.split(",")])
+    return [dict(combination) for combination in itertools.product(*axes)]
+
+def describe(params):
+    return " ".join(f"{name}={value}" for name, value in sorted(params.items())) or "-"
+
+def run_sweep(instances, solvers, grid, iteration_budget=iterations):
+    # One row per instance, seed, solver and parameter combination. The solvers draw their NumPy generators'
+    #   seeds from `random`, so reseeding it before every solve makes the same sweep build the same tours
+    rows = []
+    for name, seed, coordinates, distances, optimum in instances:
+        for solver, params in itertools.product(solvers, grid):
+            random.seed(seed)
+            options = {"iterations": iteration_budget, **params}
+            result = solve(coordinates, solver, distances=distances, **options)
+            rows.append({"instance": name, "cities": result["cities"], "seed": seed, "solver": solver,
+                         "params": describe(params), "options": describe(options), "time": result["time"],
+                         "iterations": result["iterations"],
+                         "iterations_per_second": result["iterations_per_second"],
+                         "best_distance": result["best_distance"], "best_known": optimum,
+                         "stop_reason": result["stop_reason"]})
+            logging.info(f"{solver} [{describe(params)}] on {name} (seed {seed}): "
+                         f"{result['best_distance']:.2f} in {result['time']:.2f}s")
+    return rows
+
+def fill_gaps(rows, best_known=None):
+    # Gap of every row to the best known length of its instance and seed: a published or exact optimum when
+    #   there is one, otherwise the shortest tour any run (this sweep's or the baseline's) found
+    best = dict(best_known or {})
+    for row in rows:
+        key = f"{row['instance']}/{row['seed']}"
+        candidates = [value for value in (best.get(key), row["best_known"], row["best_distance"]) if value]
+        best[key] = min(candidates)
+    for row in rows:
+        row["best_known"] = best[f"{row['instance']}/{row['seed']}"]
+        row["gap"] = tsplib.gap(row["best_distance"], row["best_known"])
+    return best
+
+def configuration(row):
+    # What a row was run with: every solve() option, the iteration budget included, not only the swept ones.
+    #   Rows from baselines that predate the options column never match a current configuration
+    return row["instance"], row["solver"], row.get("options")
+
+def summarise(rows):
+    # Mean time and length per configuration over its seeds, keyed by configuration()
+    groups = {}
+    for row in rows:
+        groups.setdefault(configuration(row), []).append(row)
+    return {key: {"time": float(np.mean([row["time"] for row in group])),
+                  "best_distance": float(np.mean([row["best_distance"] for row in group])),
+                  "seeds": sorted(row["seed"] for row in group)}
+            for key, group in groups.items()}
+
+def compare(rows, baseline_rows, time_tolerance=time_tolerance, quality_tolerance=quality_tolerance):
+    # Configurations slower or worse than the baseline beyond the tolerances, as readable messages. Only
+    #   configurations run with the same options and seeds are compared, so a changed sweep or budget is not
+    #   mistaken for a regression
+    current, baseline = summarise(rows), summarise(baseline_rows)
+    regressions = []
+    for key, now in sorted(current.items()):
+        before = baseline.get(key)
+        if before is None or before["seeds"] != now["seeds"]:
+            continue
+        label = f"{key[1]} [{key[2]}] on {key[0]}"
+        if now["time"] > before["time"] * (1 + time_tolerance) + time_slack:
+            regressions.append(f"{label}: {now['time']:.2f}s vs {before['time']:.2f}s baseline "
+                               f"(+{100 * (now['time'] / before['time'] - 1):.0f}%)")
+        if now["best_distance"] > before["best_distance"] * (1 + quality_tolerance):
+            regressions.append(f"{label}: length {now['best_distance']:.1f} vs {before['best_distance']:.1f} "
+                               f"baseline (+{100 * (now['best_distance'] / before['best_distance'] - 1):.1f}%)")
+    return regressions
+
+def write_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the TSP solvers headless and check for regressions.")
+    parser.add_argument("--cities", type=int, nargs="+", default=[50, 200], help="city counts to generate")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[1, 2, 3], help="one instance per seed and size")
+    parser.add_argument("--tsplib", nargs="+", default=[], help="TSPLIB .tsp files instead of random instances")
+    parser.add_argument("--solver", choices=("aco", "ga", "lk", "exact"), nargs="+", default=["aco", "ga"])
+    parser.add_argument("--iterations", type=positive(int), default=iterations, help="iteration / generation budget")
+    parser.add_argument("--param", action="append", default=[], metavar="NAME=V1,V2",
+                        help=f"sweep a solver parameter, repeatable: {', '.join(sweep_parameters)}")
+    parser.add_argument("--oracle", action="store_true", help="use exact optima of small instances as best known")
+    parser.add_argument("--csv", help="write one row per solve to this CSV file")
+    parser.add_argument("--json", help="write the rows to this JSON file, usable as a later --baseline")
+    parser.add_argument("--baseline", help="JSON from an earlier run to compare against")
+    parser.add_argument("--time-tolerance", type=float, default=time_tolerance)
+    parser.add_argument("--quality-tolerance", type=float, default=quality_tolerance)
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    instances = batch_instances(args.cities, args.seeds, args.tsplib, oracle=args.oracle)
+    too_large = oversized_for_exact(instances) if "exact" in args.solver else []
+    if too_large:
+        parser.error(f"--solver exact handles at most {exact_limit} cities; too large: {', '.join(too_large)}")
+    rows = run_sweep(instances, args.solver, parse_grid(args.param), args.iterations)
+    best_known = fill_gaps(rows + (baseline["rows"] if baseline else []), baseline and baseline["best_known"])
+
+    if args.csv:
+        write_csv(args.csv, rows)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"rows": rows, "best_known": best_known}, f, indent=2)
+    for key, summary in sorted(summarise(rows).items()):
+        gaps = [row["gap"] for row in rows if configuration(row) == key]
+        print(f"{key[1]:>5} {key[2]:<30} {key[0]:<12} {summary['time']:8.2f}s {summary['best_distance']:12.1f} "
+              f"{np.mean(gaps):6.2f}% above best known")
+
+    if baseline is None:
+        return 0
+    regressions = compare(rows, baseline["rows"], args.time_tolerance, args.quality_tolerance)
+    for message in regressions:
+        logging.warning(f"Regression: {message}")
+    if not regressions:
+        logging.info("No regressions against the baseline")
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
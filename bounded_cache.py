@@ -0,0 +1,83 @@
+"""Bounded least-recently-used cache for fitness values, with hit / miss telemetry.
+
+The GAs evaluate the same genomes over and over, so they memoise fitness, but an unbounded dict grows for
+the whole run. BoundedCache keeps entries in use order and evicts the oldest once an entry count or an
+estimated memory cap is exceeded, and counts hits, misses and evictions so a run can show whether the cache
+pays for itself:
+
+    cache = BoundedCache(max_bytes=16 * 2**20)
+    fit = cache.get_or_compute(genome_key, lambda: fitness(genome))
+    print(cache.stats())
+"""
+import sys
+from collections import OrderedDict
+
+default_max_bytes = 64 * 2**20 # Memory cap when none is given
+entry_overhead = 100 # Bytes of dict and linked-list bookkeeping per entry, on top of key and value
+
+def deep_size(obj):
+    # sys.getsizeof plus the contents of tuples and lists, which is what fitness keys and values are made of
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (tuple, list)):
+        size += sum(deep_size(element) for element in obj)
+    return size
+
+class BoundedCache:
+    """Mapping with least-recently-used eviction under a memory cap and an optional entry cap."""
+    def __init__(self, max_bytes=default_max_bytes, max_entries=None, sizeof=deep_size):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.sizeof = sizeof # Estimated bytes of a key or value
+        self.entries = OrderedDict() # key -> (value, bytes), least recently used first
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        # Membership counts as a lookup: `if key in cache: ... cache[key]` is one hit or one miss
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return True
+        self.misses += 1
+        return False
+
+    def __getitem__(self, key):
+        return self.entries[key][0]
+
+    def __setitem__(self, key, value):
+        size = self.sizeof(key) + self.sizeof(value) + entry_overhead
+        if key in self.entries:
+            self.bytes_used -= self.entries.pop(key)[1]
+        self.entries[key] = (value, size)
+        self.bytes_used += size
+        while self.entries and (self.bytes_used > self.max_bytes or
+                                (self.max_entries is not None and len(self.entries) > self.max_entries)):
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.bytes_used -= evicted
+            self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        # Cached value for key, calling compute() and storing its result on a miss
+        if key in self:
+            return self[key]
+        value = compute()
+        self[key] = value
+        return value
+
+    def clear(self):
+        # Drop the entries, e.g. when the problem the values belong to changes; the counters keep running
+        self.entries.clear()
+        self.bytes_used = 0
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return (f"{len(self.entries)} entries, {self.bytes_used / 2**20:.1f} MB, hit rate {100 * self.hit_rate():.1f}% "
+                f"({self.hits} hits, {self.misses} misses), {self.evictions} evictions")
@@ -0,0 +1,333 @@
+"""Permutation crossover operators for the TSP GA.
+
+Every operator takes two (children, N) int arrays of parent tours and a NumPy Generator and returns the
+children, and each child costs O(N): position arrays and boolean masks replace per-gene membership
+searches. Run the module directly for a micro-benchmark of the per-child cost against N:
+
+    python crossover.py 100 1000 10000
+"""
+import sys
+import time
+
+import numpy as np
+
+def order_crossover(parents1, parents2, rng):
+    # OX for a whole batch at once: each child keeps a random slice of its first parent and takes the
+    #   remaining cities in the second parent's order, all with boolean masks instead of per-gene searches
+    num_children, n = parents1.shape
+    rows = np.arange(num_children)[:, None]
+    cuts = np.sort(rng.integers(0, n, size=(num_children, 2)), axis=1)
+    positions = np.arange(n)
+    kept = (positions >= cuts[:, :1]) & (positions < cuts[:, 1:])
+
+    taken = np.zeros((num_children, n), dtype=bool) # taken[c, city]: city is in child c's slice
+    taken[rows, parents1] = kept
+    children = np.empty_like(parents1)
+    children[kept] = parents1[kept]
+    children[~kept] = parents2[~taken[rows, parents2]] # Row-major order keeps each row's fill in sequence
+    return children
+
+def _pmx(parent1, parent2, rng):
+    # Partially mapped crossover: parent1's slice, parent2 elsewhere, duplicates resolved through the
+    #   slice's mapping. Mapping chains never share a city, so resolving all of them is O(N) in total
+    n = len(parent1)
+    start, end = sorted(rng.integers(0, n, size=2))
+    child = parent2.copy()
+    child[start:end] = parent1[start:end]
+
+    in_slice = np.zeros(n, dtype=bool)
+    in_slice[parent1[start:end]] = True
+    mapping = np.empty(n, dtype=np.int64)
+    mapping[parent1[start:end]] = parent2[start:end]
+    outside = np.r_[0:start, end:n]
+    in_slice_list = in_slice.tolist()
+    for i in outside[in_slice[parent2[outside]]].tolist():
+        city = int(parent2[i])
+        while in_slice_list[city]:
+            city = int(mapping[city])
+        child[i] = city
+    return child
+
+def _cx(parent1, parent2, rng):
+    # Cycle crossover: positions split into cycles of parent1 -> parent2, taken alternately from each parent
+    n = len(parent1)
+    position = np.empty(n, dtype=np.int64)
+    position[parent1] = np.arange(n)
+    following = position[parent2].tolist() # Position i leads to where parent1 holds parent2[i]
+
+    seen = bytearray(n)
+    from_first = []
+    first = True
+    for start in range(n):
+        if seen[start]:
+            continue
+        i = start
+        while not seen[i]:
+            seen[i] = 1
+            if first:
+                from_first.append(i)
+            i = following[i]
+        first = not first
+
+    child = parent2.copy()
+    child[from_first] = parent1[from_first]
+    return child
+
+def _erx(parent1, parent2, rng):
+    # Edge recombination: walk the union of both parents' roads, preferring roads both parents share and
+    #   then the neighbour with the fewest roads left. Degrees are updated in place rather than recomputed
+    n = len(parent1)
+    edges = np.empty((n, 4), dtype=np.int64) # Each city's neighbours in parent1, then in parent2
+    edges[parent1, 0], edges[parent1, 1] = np.roll(parent1, 1), np.roll(parent1, -1)
+    edges[parent2, 2], edges[parent2, 3] = np.roll(parent2, 1), np.roll(parent2, -1)
+
+    neighbours = [] # Distinct neighbours per city, roads both parents share first
+    shared_count = []
+    for row in edges.tolist():
+        shared = {c for c in row if row.count(c) > 1}
+        neighbours.append(list(shared) + [c for c in set(row) if c not in shared])
+        shared_count.append(len(shared))
+    degree = [len(row) for row in neighbours]
+
+    unvisited = list(range(n)) # Swap-remove list for O(1) random restarts
+    slot = list(range(n))
+    visited = bytearray(n)
+    child = np.empty(n, dtype=parent1.dtype)
+    city = int(parent1[0])
+    for step in range(n):
+        child[step] = city
+        visited[city] = 1
+        last = unvisited.pop()
+        if last != city:
+            unvisited[slot[city]] = last
+            slot[last] = slot[city]
+        for c in neighbours[city]:
+            degree[c] -= 1
+
+        best = None
+        for k, c in enumerate(neighbours[city]):
+            if visited[c]:
+                continue
+            if k < shared_count[city]: # A road both parents use
+                best = c
+                break
+            if best is None or degree[c] < degree[best]:
+                best = c
+        if best is None and unvisited:
+            best = unvisited[int(rng.integers(len(unvisited)))]
+        city = best
+    return child
+
+def _per_child(operator):
+    def crossover(parents1, parents2, rng):
+        children = np.empty_like(parents1)
+        for c in range(len(parents1)):
+            children[c] = operator(parents1[c], parents2[c], rng)
+        return children
+    return crossover
+
+partially_mapped_crossover = _per_child(_pmx)
+cycle_crossover = _per_child(_cx)
+edge_recombination = _per_child(_erx)
+
+crossovers = {"OX": order_crossover, "PMX": partially_mapped_crossover, "CX": cycle_crossover,
+              "ERX": edge_recombination}
+
+def _tour_links(tour):
+    # links[city] = (previous, next) city along the tour
+    links = np.empty((len(tour), 2), dtype=np.int64)
+    links[tour, 0] = np.roll(tour, 1)
+    links[tour, 1] = np.roll(tour, -1)
+    return links
+
+def _edge(u, v):
+    return (u, v) if u < v else (v, u)
+
+def ab_cycles(parent_a, parent_b, rng):
+    # Split the roads the parents do not share into AB-cycles: closed walks alternating a road of A and a
+    #   road of B. Returns each cycle as (A roads, B roads)
+    links_a, links_b = _tour_links(parent_a), _tour_links(parent_b)
+    remaining = ({}, {}) # Per edge type (0 = A, 1 = B): city -> unshared neighbours not yet walked
+    for kind, (own, other) in enumerate(((links_a, links_b), (links_b, links_a))):
+        following = own[:, 1]
+        unshared = np.flatnonzero((other[:, 0] != following) & (other[:, 1] != following))
+        table = remaining[kind]
+        for u, v in zip(unshared.tolist(), following[unshared].tolist()):
+            table.setdefault(u, []).append(v)
+            table.setdefault(v, []).append(u)
+
+    cycles = []
+    starts = list(remaining[0])
+    rng.shuffle(starts)
+    for start in starts:
+        path = [start]
+        where = {start: [0]} # city -> its indices in path
+        while True:
+            u = path[-1]
+            kind = (len(path) - 1) % 2 # Road k of the walk is an A road when k is even
+            options = remaining[kind].get(u)
+            if not options:
+                break # Only possible back at the start with nothing left to walk
+            v = options.pop(int(rng.integers(len(options))))
+            remaining[kind][v].remove(u)
+            path.append(v)
+            end = len(path) - 1
+
+            # The walk closes an alternating cycle when v was already reached after an even number of roads
+            indices = where.setdefault(v, [])
+            closing = next((q for q in reversed(indices) if (end - q) % 2 == 0), None)
+            indices.append(end)
+            if closing is None:
+                continue
+            roads = ([], [])
+            for k in range(closing, end):
+                roads[k % 2].append(_edge(path[k], path[k + 1]))
+            cycles.append(roads)
+            for q in range(end, closing, -1):
+                where[path[q]].pop()
+            del path[closing + 1:]
+    return cycles
+
+def _subtours(tour, position, removed, added):
+    # Tour minus `removed` (roads of tour) plus `added`, as cycles of tour segments: ([(start, end, forward)],
+    #   city count) per cycle. Only the k cut points are walked, so this is O(k log k), not O(N)
+    n = len(tour)
+    cuts = sorted({position[u] if (position[u] + 1) % n == position[v] else position[v] for u, v in removed})
+    if not cuts:
+        return [([(0, n - 1, True)], n)]
+    k = len(cuts)
+    starts = [(cuts[j - 1] + 1) % n for j in range(k)]
+    ends = cuts
+    slots = {} # city -> free segment ends (segment, side) it sits on; side 0 = start, 1 = end
+    for j in range(k):
+        slots.setdefault(tour[starts[j]], []).append((j, 0))
+        slots.setdefault(tour[ends[j]], []).append((j, 1))
+    link = {}
+    for u, v in added:
+        a, b = slots[u].pop(), slots[v].pop()
+        link[a], link[b] = b, a
+
+    cycles = []
+    seen = [False] * k
+    for first in range(k):
+        if seen[first]:
+            continue
+        segments = []
+        size = 0
+        j, side = first, 0
+        while not seen[j]:
+            seen[j] = True
+            segments.append((starts[j], ends[j], side == 0))
+            size += (ends[j] - starts[j]) % n + 1
+            j, side = link[(j, 1 - side)]
+        cycles.append((segments, size))
+    return cycles
+
+def _cities(tour, segments):
+    # Cities of a cycle of segments in walking order
+    parts = []
+    for start, end, forward in segments:
+        part = tour[start:end + 1] if start <= end else np.concatenate([tour[start:], tour[:end + 1]])
+        parts.append(part if forward else part[::-1])
+    return np.concatenate(parts)
+
+def _toggle(edges, other, e):
+    # Move road e out of one bookkeeping set: a removed road of A comes back, an added road goes away
+    if e in edges:
+        edges.remove(e)
+    else:
+        other.add(e)
+
+def _merge_subtours(tour, position, removed, added, distance_matrix, neighbours, rng):
+    # Join subtours greedily until one tour is left: the smallest subtour swaps one of its roads and one
+    #   road of another subtour near it (from the neighbour lists) for the two cheapest connecting roads
+    n = len(tour)
+    while True:
+        cycles = _subtours(tour, position, removed, added)
+        if len(cycles) == 1:
+            return cycles[0][0]
+        cycles.sort(key=lambda cycle: cycle[1])
+        orders = [_cities(tour, segments) for segments, _ in cycles]
+        succ = np.empty(n, dtype=np.int64)
+        pred = np.empty(n, dtype=np.int64)
+        owner = np.empty(n, dtype=np.int64)
+        for c, order in enumerate(orders):
+            succ[order] = np.roll(order, -1)
+            pred[order] = np.roll(order, 1)
+            owner[order] = c
+
+        u = orders[0]
+        u1 = succ[u]
+        w = neighbours[u]
+        if not (owner[w] != 0).any(): # No neighbour outside: fall back to the nearest outside cities
+            sample = u[rng.choice(len(u), size=min(len(u), 10), replace=False)]
+            rows = np.array(distance_matrix[sample], dtype=np.float64)
+            rows[:, owner == 0] = np.inf
+            u = sample
+            u1 = succ[u]
+            w = np.argmin(rows, axis=1)[:, None]
+        u, u1 = u[:, None], u1[:, None]
+        outside = owner[w] != 0
+        removed_length = distance_matrix[u, u1] + np.zeros(w.shape)
+
+        best = None
+        for w1 in (succ[w], pred[w]):
+            base = removed_length + distance_matrix[w, w1]
+            for a, b in ((w, w1), (w1, w)): # u joins a and u1 joins b
+                gain = distance_matrix[u, a] + distance_matrix[u1, b] - base
+                gain = np.where(outside, gain, np.inf)
+                i, k = np.unravel_index(int(np.argmin(gain)), gain.shape)
+                if best is None or gain[i, k] < best[0]:
+                    best = (gain[i, k], int(u[i, 0]), int(u1[i, 0]), int(w[i, k]), int(w1[i, k]), int(a[i, k]),
+                            int(b[i, k]))
+        _, x, x1, y, y1, a, b = best
+        for e in (_edge(x, x1), _edge(y, y1)):
+            _toggle(added, removed, e)
+        for e in (_edge(x, a), _edge(x1, b)):
+            _toggle(removed, added, e)
+
+def _length(distance_matrix, edges):
+    if not edges:
+        return 0.0
+    u, v = np.array(list(edges)).T
+    return float(np.sum(distance_matrix[u, v], dtype=np.float64))
+
+def edge_assembly_crossover(parent_a, parent_b, distance_matrix, neighbours, rng, num_children=30):
+    # EAX with single-AB-cycle E-sets: each child is parent A with one AB-cycle's A roads swapped for its
+    #   B roads, subtours then merged greedily. Returns the best child shorter than A and how much shorter
+    #   it is, or (None, 0.0) when no child improves on A
+    position = np.empty(len(parent_a), dtype=np.int64)
+    position[parent_a] = np.arange(len(parent_a))
+    position = position.tolist()
+    cycles = ab_cycles(parent_a, parent_b, rng)
+    if len(cycles) > num_children:
+        cycles = [cycles[i] for i in rng.choice(len(cycles), size=num_children, replace=False)]
+
+    best_child, best_gain = None, 0.0
+    for a_roads, b_roads in cycles:
+        removed, added = set(a_roads), set(b_roads)
+        segments = _merge_subtours(parent_a, position, removed, added, distance_matrix, neighbours, rng)
+        gain = _length(distance_matrix, added) - _length(distance_matrix, removed)
+        if gain < best_gain - 1e-9:
+            best_child, best_gain = _cities(parent_a, segments), gain
+    return best_child, best_gain
+
+def benchmark(sizes=(100, 1000, 10000), num_children=50, seed=0):
+    # Microseconds per child for every operator at each tour length
+    rng = np.random.default_rng(seed)
+    results = {}
+    for n in sizes:
+        parents1 = np.argsort(rng.random((num_children, n)), axis=1).astype(np.int32)
+        parents2 = np.argsort(rng.random((num_children, n)), axis=1).astype(np.int32)
+        for name, operator in crossovers.items():
+            start = time.perf_counter()
+            operator(parents1, parents2, rng)
+            results[name, n] = 1e6 * (time.perf_counter() - start) / num_children
+    return results
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 1000, 10000]
+    results = benchmark(sizes)
+    print("N".rjust(8) + "".join(name.rjust(12) for name in crossovers) + "   (us per child)")
+    for n in sizes:
+        print(str(n).rjust(8) + "".join(f"{results[name, n]:12.1f}" for name in crossovers))
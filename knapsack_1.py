@@ -5,6 +5,10 @@ from tkinter import *
 import threading
 import time
 
+import numpy as np
+
+from bounded_cache import BoundedCache
+
 num_items = 100
 frac_target = 0.7
 min_value = 128
@@ -19,7 +23,13 @@ pop_size = 50
 elitism_count = 2
 mutation_rate = 0.1
 
-sleep_time = 0.1
+frame_rate = 30 # Redraws per second of the solver's newest result, however fast it runs
+frame_interval = 1000 // frame_rate # Milliseconds between redraws
+
+solver_modes = ("GA", "Exact")
+num_seeds = 5 # Near-target genomes from the subset-sum table placed in the GA's first population
+sum_cache_bytes = 32 * 2**20 # Memory cap of the GA's genome sum cache
+sum_cache_min_hit_rate = 0.05 # Once a population's worth of lookups hits less often, the GA stops using the cache
 
 def random_rgb_color():
     red = random.randint(0x10, 0xff)
@@ -62,6 +72,55 @@ class Item:
                                     outline=self.color,
                                     width=stroke_width)
 
+def subset_sum_table(values, limit):
+    # Reachable sums as Python big-int bitsets: bit s of reach[k] is set when some subset of the first k
+    #   values adds up to s, for every s up to limit
+    mask = (1 << (limit + 1)) - 1
+    reach = [1]
+    for value in values:
+        reach.append((reach[-1] | (reach[-1] << value)) & mask)
+    return reach
+
+def subset_for_sum(values, reach, total):
+    # Walk the prefix bitsets back from a reachable total: item k is only needed when the first k - 1 items
+    #   cannot reach the remaining sum without it
+    genome = [False] * len(values)
+    for k in range(len(values), 0, -1):
+        if not (reach[k - 1] >> total) & 1:
+            genome[k - 1] = True
+            total -= values[k - 1]
+    return genome
+
+def nearest_sums(reach, target, limit, count):
+    # The `count` reachable sums closest to the target, the target itself first when it is reachable
+    sums = []
+    for offset in range(limit + 1):
+        for total in sorted({target - offset, target + offset}):
+            if 0 <= total <= limit and (reach >> total) & 1:
+                sums.append(total)
+        if len(sums) >= count:
+            break
+    return sums[:count]
+
+def near_target_genomes(values, target, count=num_seeds):
+    # Genomes for the reachable sums closest to the target; overshooting by more than one item never helps
+    limit = target + max(values, default=0)
+    reach = subset_sum_table(values, limit)
+    return [subset_for_sum(values, reach, total) for total in nearest_sums(reach[-1], target, limit, count)]
+
+def pack_genes(genes):
+    # Genome rows as packed bits, 8 genes a byte; the bytes of a packed row are that genome's cache key
+    return np.packbits(genes, axis=-1)
+
+def unpack_genes(packed, count):
+    # Back to one 0 / 1 uint8 gene per item, for the genetic operators
+    return np.unpackbits(packed, axis=-1, count=count)
+
+class ResultSlot:
+    """Newest (generation, genome, sum) one solver run published; replaced whole, so no lock is needed."""
+    def __init__(self):
+        self.latest = None
+
 class UI(tk.Tk):
     def __init__(self):
         tk.Tk.__init__(self)
@@ -108,8 +167,15 @@ class UI(tk.Tk):
         self.run_button = Button(self.toolbar, text="Run", command=self.start_thread)
         self.run_button.place(x=380, y=8)
 
+        # Solver used by "Run": the GA, or the exact subset-sum table
+        self.mode_var = StringVar(value="GA")
+        OptionMenu(self.toolbar, self.mode_var, *solver_modes).place(x=430, y=6)
+
         self.items_list = []
 
+        self.stop_event = threading.Event() # Set to stop the running solver thread
+        self.slot = ResultSlot() # Where the current run publishes; each run gets a fresh one
+
         # We create a standard banner menu bar and attach it to the window
         menu_bar = Menu(self)
         self['menu'] = menu_bar
@@ -142,8 +208,30 @@ class UI(tk.Tk):
         self.mainloop()
     
     def start_thread(self):
-            thread = threading.Thread(target=self.run, args=())
+            # Stop any solver still running, solve on a background thread as fast as it goes, and let the Tk
+            #   thread redraw whatever it last published on its own frame clock
+            self.stop_event.set()
+            self.stop_event = threading.Event()
+            self.slot = ResultSlot() # A stopped run may still publish once, into its own slot
+            thread = threading.Thread(target=self.run, args=(self.mode_var.get(), self.stop_event, self.slot),
+                                      daemon=True)
             thread.start()
+            self.after(frame_interval, self.render_frame, thread, self.slot)
+
+    def render_frame(self, thread, slot, drawn=None):
+        # Tk thread: draw the newest result the run published if it changed, until the solver thread has
+        #   finished and its last result is on screen, or a newer run has replaced this one
+        if slot is not self.slot:
+            return
+        latest = slot.latest
+        if latest is not None and latest is not drawn:
+            generation, genome, current_sum = latest
+            self.clear_canvas()
+            self.draw_target()
+            self.draw_sum(current_sum, self.target)
+            self.draw_genome(genome, generation)
+        if thread.is_alive() or latest is not slot.latest:
+            self.after(frame_interval, self.render_frame, thread, slot, latest)
 
         #menu_K.add_command(label="Run", command=start_thread, underline=0)
     
@@ -267,139 +355,182 @@ class UI(tk.Tk):
         # Generation number
         self.canvas.create_text(x, y_gen, text=f'Generation {gen_num}', font=('Arial', 18), anchor="w")
             
-    def run(self):
+    def run_exact(self, slot):
+        # Solve the subset-sum target exactly with the bitset table and show the subset it finds
+        self.start_time = time.time()
+        values = [item.value for item in self.items_list]
+        best = near_target_genomes(values, self.target, 1)[0]
+        current_sum = sum(value for value, gene in zip(values, best) if gene)
+        print(f"Exact solver: Genome Sum: {current_sum}, Target: {self.target}, "
+              f"{(time.time() - self.start_time) * 1000:.1f} ms")
+
+        slot.latest = (0, best, current_sum)
+
+    def run(self, mode="GA", stop=None, slot=None):
+        # Solver thread: never touches Tk, only publishes its best genome to `slot`; the mode is read from the
+        #   menu on the Tk thread and passed in
+        slot = slot if slot is not None else ResultSlot()
+        if mode == "Exact":
+            self.run_exact(slot)
+            return
         global pop_size
         global num_generations
-        fitness_cache = {}
-        no_improvement_counter = 0
-
-        def gene_sum(genome):
-            return sum(self.items_list[i].value for i in range(len(genome)) if genome[i])
-
-        def fitness(genome):
-            genome_tuple = tuple(genome)
-            if genome_tuple in fitness_cache:
-                return fitness_cache[genome_tuple]
+        global mutation_rate
+        # The population is a (pop_size, num_items) matrix of genes, one genome per row, so sums, penalties,
+        #   selection and the genetic operators each run once over the whole population. Between generations
+        #   it is kept bit-packed, together with the item sum of every genome
+        values = np.array([item.value for item in self.items_list], dtype=np.int64)
+        rng = np.random.default_rng(random.randrange(2**32))
+        genes_index = np.arange(num_items)
+        sum_cache = BoundedCache(max_bytes=sum_cache_bytes) # Packed genome bytes -> item sum
+
+        def gene_sums(pop):
+            # Item sum of every genome as one matrix-vector product
+            return pop @ values
+
+        def cache_pays():
+            # Large populations rarely repeat a genome, and then the lookups cost more than the sums
+            return sum_cache.misses <= pop_size or sum_cache.hit_rate() >= sum_cache_min_hit_rate
+
+        def cached_sums(genomes):
+            # Item sums of genome rows: the ones the run has seen before come from the cache by packed key,
+            #   the rest from one product over just those rows
+            if not cache_pays():
+                return gene_sums(genomes)
+            keys = [row.tobytes() for row in pack_genes(genomes)]
+            sums = np.empty(len(keys), dtype=np.int64)
+            missing = []
+            for i, key in enumerate(keys):
+                if key in sum_cache:
+                    sums[i] = sum_cache[key]
+                else:
+                    missing.append(i)
+            if missing:
+                sums[missing] = gene_sums(genomes[missing])
+                for i in missing:
+                    sum_cache[keys[i]] = int(sums[i])
+            return sums
+
+        def remember_sums(packed, sums):
+            if not cache_pays():
+                return
+            for row, total in zip(packed, sums.tolist()):
+                sum_cache[row.tobytes()] = total
 
-            total_value = gene_sum(genome)
-            if total_value > self.target:
-                fit = (total_value - self.target) ** 2  # Quadratic penalty
-            else:
-                fit = abs(total_value - self.target)  # Linear penalty
-            fitness_cache[genome_tuple] = fit
-            return fit
+        def fitness(sums):
+            over = sums - self.target
+            return np.where(over > 0, over ** 2, np.abs(over)) # Quadratic penalty above the target, linear below
 
         def initialize_population():
-            population = []
-            while len(population) < pop_size:
-                genome = [random.random() < frac_target for _ in range(num_items)]
-                population.append(genome)
-            return population
-
-        def select_parents(last_pop, fitnesses):
-            parent1 = tournament_selection(last_pop, fitnesses)
-            parent2 = tournament_selection(last_pop, fitnesses)
-            return parent1, parent2
-
-        # def select_parents(last_pop, fitnesses): #roulette wheel
-        #     parent1 = roulette_selection(last_pop, fitnesses)
-        #     parent2 = roulette_selection(last_pop, fitnesses)
-        #     while parent1 == parent2:  # Compare parents
-        #         parent2 = roulette_selection(last_pop, fitnesses)
-        #     return parent1, parent2
-
-        def tournament_selection(last_pop, fitnesses, tournament_size=5):
-            tournament_indices = random.sample(range(len(last_pop)), tournament_size)
-            best_index = min(tournament_indices, key=lambda i: fitnesses[i])
-            return last_pop[best_index]
-        
-        def refined_crossover(parent1, parent2):
-            point1 = random.randint(0, len(parent1) // 2)
-            point2 = random.randint(len(parent1) // 2, len(parent1) - 1)
-            child = parent1[:point1] + parent2[point1:point2] + parent1[point2:]
-            return child
-
-        def controlled_mutation(genome):
-            for i in range(len(genome)):
-                if random.random() < mutation_rate:
-                    genome[i] = not genome[i]
-            # Adjust genome to move closer to the target
-            while gene_sum(genome) > self.target:
-                idx = random.choice([i for i, g in enumerate(genome) if g])
-                genome[idx] = False
-            while gene_sum(genome) < self.target:
-                idx = random.choice([i for i, g in enumerate(genome) if not g])
-                genome[idx] = True
-            return genome
-        
-        def rank_selection(last_pop, fitnesses):
-            sorted_indices = sorted(range(len(fitnesses)), key=lambda i: fitnesses[i])
-            total_rank = sum(range(1, len(fitnesses) + 1))
-            pick = random.uniform(0, total_rank)
-            cumulative = 0
-            for rank, idx in enumerate(sorted_indices):
-                cumulative += rank + 1
-                if cumulative > pick:
-                    return last_pop[idx]
-        
-        def targeted_mutate(genome):
-            for i in range(len(genome)):
-                if random.random() < mutation_rate:
-                    genome[i] = not genome[i]
-                    if gene_sum(genome) > self.target:
-                        genome[i] = not genome[i]  # Revert if exceeds the target
-            return genome
-
-        # def roulette_selection(last_pop, fitnesses): #roulette wheel
-        #     total_fitness = sum(fitnesses)
-        #     pick = random.uniform(0, total_fitness)
-        #     current = 0
-        #     for i, fitness in enumerate(fitnesses):
-        #         current += fitness
-        #         if current > pick:
-        #             return last_pop[i]
-
-        # def multi_point_crossover(parent1, parent2, num_points=3):
-        #     length = len(parent1)
-        #     points = sorted(random.sample(range(1, length), num_points))  # set points
-        #     child = parent1[:]
-        #     for i in range(len(points)):
-        #         if i % 2 == 0:  # change parents
-        #           start = points[i]
-        #           end = points[i + 1] if i + 1 < len(points) else length
-        #           child[start:end] = parent2[start:end]  # Replace selection
-        #     return child
-
-        def uniform_crossover(parent1, parent2):
-            return [random.choice([p1, p2]) for p1, p2 in zip(parent1, parent2)]
-
-        # def crossover(parent1, parent2):
-        #     point = random.randint(1, len(parent1) - 1)  # 1st and last gen
-        #     return parent1[:point] + parent2[point:]
-
-        # def swap_mutate(genome):
-        #     num_genes_to_swap = random.randint(1, 3)  # Change between 1 and 3 genes
-        #     for _ in range(num_genes_to_swap):
-        #         idx1, idx2 = random.sample(range(len(genome)), 2)
-        #         genome[idx1], genome[idx2] = genome[idx2], genome[idx1]
-        #     return genome
-
-        # def random_value_mutate(genome):
-        #     for i in range(len(genome)):
-        #         if random.random() < mutation_rate:
-        #             genome[i] = random.random() < frac_target  # new value
-        #     return genome
-
-        def mutate(genome):
-            global mutation_rate 
-            for i in range(len(genome)):
-                if random.random() < mutation_rate:
-                    genome[i] = not genome[i]
-            return genome
-
-        def generation_step(generation=0, pop=None):
-            nonlocal no_improvement_counter
+            # Start from the subset sums closest to the target, then random genomes
+            seeds = near_target_genomes(values.tolist(), self.target)[:pop_size]
+            seeds = np.array(seeds, dtype=np.uint8).reshape(len(seeds), num_items)
+            randoms = (rng.random((pop_size - len(seeds), num_items), dtype=np.float32) < frac_target).astype(np.uint8)
+            return np.vstack([seeds, randoms])
+
+        def select_parents(last_pop, fitnesses, count):
+            # Winners are picked as packed rows and only unpacked for crossover
+            parents1 = tournament_selection(fitnesses, count)
+            parents2 = tournament_selection(fitnesses, count)
+            return unpack_genes(last_pop[parents1], num_items), unpack_genes(last_pop[parents2], num_items)
+
+        # def select_parents(last_pop, fitnesses, count): #roulette wheel
+        #     parents1 = roulette_selection(fitnesses, count)
+        #     parents2 = roulette_selection(fitnesses, count)
+        #     return last_pop[parents1], last_pop[parents2]
+
+        def tournament_selection(fitnesses, count, tournament_size=5):
+            # Winner of each of `count` tournaments as a population index, all drawn at once
+            entrants = rng.integers(0, len(fitnesses), size=(count, tournament_size))
+            return entrants[np.arange(count), np.argmin(fitnesses[entrants], axis=1)]
+
+        def refined_crossover(parents1, parents2):
+            count = len(parents1)
+            point1 = rng.integers(0, num_items // 2, size=count, endpoint=True)
+            point2 = rng.integers(num_items // 2, num_items - 1, size=count, endpoint=True)
+            # Genes point1 .. point2 - 1 come from parent2
+            middle = (genes_index >= point1[:, None]) & (genes_index < point2[:, None])
+            children = np.where(middle, parents2, parents1)
+            return children
+
+        def controlled_mutation(children):
+            children ^= rng.random(children.shape, dtype=np.float32) < mutation_rate
+            # Adjust genomes to move closer to the target: drop items in a random order while over it, then add
+            #   items in the reverse order while under it. Running sums along that order decide every gene at once
+            order = np.argsort(rng.random(children.shape, dtype=np.float32), axis=1)
+            rows = np.arange(len(children))[:, None]
+            genes = children[rows, order]
+            ordered_values = values.astype(np.int32)[order] # Sums of up to num_items * max_value fit in int32
+            sums = cached_sums(children).astype(np.int32)
+            gains = genes * ordered_values
+            # An item is dropped while what the earlier drops removed is still short of the excess
+            before = np.cumsum(gains, axis=1, dtype=np.int32) - gains
+            dropped = (before < (sums - self.target)[:, None]) & (genes == 1)
+            genes[dropped] = 0
+            sums -= (gains * dropped).sum(axis=1, dtype=np.int32)
+            gains = ((1 - genes) * ordered_values)[:, ::-1]
+            before = np.cumsum(gains, axis=1, dtype=np.int32) - gains
+            added = (before < (self.target - sums)[:, None]) & (genes[:, ::-1] == 0)
+            genes[:, ::-1][added] = 1
+            sums += (gains * added).sum(axis=1, dtype=np.int32)
+            children[rows, order] = genes
+            # The repair kept every child's sum up to date, so the next generation need not recompute them
+            return children, sums.astype(np.int64)
+
+        def rank_selection(fitnesses, count):
+            # Rank 1 goes to the lowest fitness, and a genome is drawn with probability proportional to its rank
+            ranks = np.empty(len(fitnesses))
+            ranks[np.argsort(fitnesses)] = np.arange(1, len(fitnesses) + 1)
+            return rng.choice(len(fitnesses), size=count, p=ranks / ranks.sum())
+
+        def targeted_mutate(children):
+            flips = rng.random(children.shape, dtype=np.float32) < mutation_rate
+            children[flips & (children == 1)] = 0
+            # Added items are kept in gene order for as long as the sum stays within the target
+            gains = (flips & (children == 0)) * values
+            kept = gene_sums(children)[:, None] + np.cumsum(gains, axis=1) <= self.target
+            children[(gains > 0) & kept] = 1
+            return children
+
+        # def roulette_selection(fitnesses, count): #roulette wheel
+        #     return rng.choice(len(fitnesses), size=count, p=fitnesses / fitnesses.sum())
+
+        # def multi_point_crossover(parents1, parents2, num_points=3):
+        #     points = np.sort(rng.integers(1, num_items, size=(len(parents1), num_points)), axis=1)
+        #     from_second = (genes_index >= points[:, :, None]).sum(axis=1) % 2 == 1  # change parents
+        #     return np.where(from_second, parents2, parents1)
+
+        def uniform_crossover(parents1, parents2):
+            from_second = rng.random(parents1.shape, dtype=np.float32) < 0.5
+            return np.where(from_second, parents2, parents1)
+
+        # def crossover(parents1, parents2):
+        #     point = rng.integers(1, num_items, size=len(parents1))  # 1st and last gen
+        #     return np.where(genes_index < point[:, None], parents1, parents2)
+
+        # def swap_mutate(children):
+        #     rows = np.arange(len(children))
+        #     idx1, idx2 = rng.integers(0, num_items, size=(2, len(children)))
+        #     children[rows, idx1], children[rows, idx2] = children[rows, idx2], children[rows, idx1]
+        #     return children
+
+        # def random_value_mutate(children):
+        #     redraw = rng.random(children.shape, dtype=np.float32) < mutation_rate
+        #     children[redraw] = rng.random(redraw.sum()) < frac_target  # new value
+        #     return children
+
+        def mutate(children):
             global mutation_rate
+            children ^= rng.random(children.shape, dtype=np.float32) < mutation_rate
+            return children
+
+        self.start_time = time.time()
+        genomes = initialize_population()
+        pop = pack_genes(genomes)
+        sums = cached_sums(genomes)
+        for generation in range(num_generations):
+            if stop is not None and stop.is_set():
+                return
 
             if generation < 50:
                 mutation_rate = 0.1  # Moderate mutation rate
@@ -407,47 +538,39 @@ class UI(tk.Tk):
                 mutation_rate = 0.05  # Low mutation rate
             else:
                 mutation_rate *= 0.95  # Decay mutation rate
-                
-            if generation == 0:
-                self.start_time = time.time()  # Start timing at the first generation
-
-            if pop is None:
-                pop = initialize_population()
 
-            fitnesses = [fitness(genome) for genome in pop]
-            best_of_gen = min(pop, key=lambda genome: fitness(genome))
-            current_sum = gene_sum(best_of_gen)
-            min_fitness = fitness(best_of_gen)
+            fitnesses = fitness(sums)
+            best = int(np.argmin(fitnesses))
+            best_of_gen = unpack_genes(pop[best], num_items)
+            current_sum = int(sums[best])
+            min_fitness = int(fitnesses[best])
 
             print(f"Generation {generation}, Best fitness: {min_fitness}")
+            if generation and generation % 100 == 0:
+                print(f"Sum cache: {sum_cache.stats()}")
 
-            self.after(0, self.clear_canvas)
-            self.after(0, self.draw_target)
-            self.after(0, self.draw_sum, current_sum, self.target)
-            self.after(0, self.draw_genome, best_of_gen, generation)
+            # One assignment swaps in a new tuple, so the Tk thread never sees a half-written result
+            slot.latest = (generation, best_of_gen, current_sum)
 
             if current_sum == self.target:
                 print(f"Optimal solution found at generation {generation}")
+                print(f"Sum cache: {sum_cache.stats()}")
                 print(f"Exact solution found. Generation {generation}, Genome Sum: {current_sum}, Target: {self.target}")
                 return
 
             # Elite preservation
-            new_pop = []
-            elites = sorted(range(len(fitnesses)), key=lambda i: fitnesses[i])[:elitism_count]
-            for e in elites:
-                new_pop.append(pop[e])
+            elites = np.argpartition(fitnesses, elitism_count - 1)[:elitism_count]
 
             # Generate the rest of the population
-            while len(new_pop) < pop_size:
-                parent1, parent2 = select_parents(pop, fitnesses)
-                child = refined_crossover(parent1, parent2)
-                child = controlled_mutation(child)
-                new_pop.append(child)
-
-            self.after(int(sleep_time * 1000), generation_step, generation + 1, new_pop)
-
-        generation_step.best_fitness = float("inf")
-        generation_step()
+            parents1, parents2 = select_parents(pop, fitnesses, pop_size - elitism_count)
+            children = refined_crossover(parents1, parents2)
+            children, child_sums = controlled_mutation(children)
+            packed_children = pack_genes(children)
+            remember_sums(packed_children, child_sums)
+            pop = np.vstack([pop[elites], packed_children])
+            sums = np.concatenate([sums[elites], child_sums])
+        print(f"Stopped after {num_generations} generations, Genome Sum: {slot.latest[2]}, Target: {self.target}")
+        print(f"Sum cache: {sum_cache.stats()}")
     
 # In python, we have this odd construct to catch the main thread and instantiate our Window class
 if __name__ == '__main__':
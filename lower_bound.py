@@ -0,0 +1,105 @@
+"""Held-Karp lower bound for the symmetric TSP.
+
+A 1-tree is a minimum spanning tree over every city but one, plus the two shortest roads from that city;
+every tour is a 1-tree, so the cheapest 1-tree bounds the optimum from below. Subgradient optimisation adds
+a penalty to each city that pushes the tree towards degree 2 everywhere, which tightens the bound to
+within about 1% of the optimum on Euclidean instances. Run the module directly to compare the bound with
+the published optima of TSPLIB files:
+
+    python lower_bound.py berlin52.tsp kroA100.tsp
+"""
+import sys
+import time
+
+import numpy as np
+
+bound_iterations = 1000 # Subgradient steps at most
+bound_period = 20 # Steps without a better bound before the step size is halved
+min_step_scale = 1e-4 # Stop once the step size has been halved this far
+
+def minimum_spanning_tree(distance_matrix, penalties=None, skip=None):
+    # Prim's algorithm, one NumPy pass over a distance row per added city, so it reads each row once and
+    #   works on the on-the-fly matrix too. Costs are d[i, j] + penalties[i] + penalties[j]; `skip` leaves one
+    #   city out. Returns (parent, length) with parent[root] == parent[skip] == -1
+    n = len(distance_matrix)
+    penalties = np.zeros(n) if penalties is None else penalties
+    in_tree = np.zeros(n, dtype=bool)
+    key = np.full(n, np.inf)
+    parent = np.full(n, -1, dtype=np.int64)
+    if skip is not None:
+        in_tree[skip] = True
+    current = 1 if skip == 0 else 0
+    in_tree[current] = True
+    length = 0.0
+    for _ in range(n - in_tree.sum()):
+        row = np.asarray(distance_matrix[current], dtype=np.float64) + penalties[current] + penalties
+        closer = (row < key) & ~in_tree
+        key[closer] = row[closer]
+        parent[closer] = current
+        current = int(np.argmin(key))
+        length += key[current]
+        in_tree[current] = True
+        key[current] = np.inf
+    return parent, length
+
+def one_tree(distance_matrix, penalties, special=0):
+    # Cheapest 1-tree under the penalties: returns (cost, degrees), cost still including the penalties
+    parent, length = minimum_spanning_tree(distance_matrix, penalties, skip=special)
+    degrees = np.zeros(len(distance_matrix), dtype=np.int64)
+    np.add.at(degrees, parent[parent >= 0], 1)
+    degrees[parent >= 0] += 1
+
+    row = np.asarray(distance_matrix[special], dtype=np.float64) + penalties[special] + penalties
+    row[special] = np.inf
+    nearest = np.argpartition(row, 1)[:2]
+    degrees[nearest] += 1
+    degrees[special] = 2
+    return length + row[nearest].sum(), degrees
+
+def held_karp_bound(distance_matrix, upper_bound, iterations=bound_iterations, time_limit=None, control=None):
+    # Subgradient optimisation of the 1-tree penalties (Held and Karp). `upper_bound` is the length of any
+    #   tour and sets the step size. Every step's value is a valid bound, so stopping early on the time limit
+    #   or a cancelled control still returns one after the first step. Returns (bound, penalties)
+    n = len(distance_matrix)
+    if n < 3:
+        return float(upper_bound), np.zeros(n)
+    start_time = time.time()
+    penalties = np.zeros(n)
+    best, best_penalties = -np.inf, penalties.copy()
+    scale, since_better = 2.0, 0
+    for _ in range(iterations):
+        cost, degrees = one_tree(distance_matrix, penalties)
+        bound = cost - 2.0 * penalties.sum()
+        if bound > best + 1e-9:
+            best, best_penalties = bound, penalties.copy()
+            since_better = 0
+        else:
+            since_better += 1
+            if since_better >= bound_period:
+                scale /= 2
+                since_better = 0
+        subgradient = degrees - 2
+        norm = float((subgradient ** 2).sum())
+        # Degree 2 everywhere means the 1-tree is itself an optimal tour
+        if norm == 0 or bound >= upper_bound or scale < min_step_scale:
+            break
+        penalties += scale * (upper_bound - bound) / norm * subgradient
+        if time_limit is not None and time.time() - start_time >= time_limit:
+            break
+        if control is not None and not control.proceed():
+            break
+    return float(min(best, upper_bound)), best_penalties
+
+if __name__ == '__main__':
+    import tsplib
+    from tsp_core import instance_distances, nearest_neighbour_tour
+
+    for file_path in sys.argv[1:]:
+        problem = tsplib.read_tsplib(file_path)
+        distances = instance_distances(problem)
+        start_time = time.time()
+        upper = tsplib.tour_length(nearest_neighbour_tour(distances), distances)
+        bound, _ = held_karp_bound(distances, upper)
+        optimum = f"{problem.optimum}, {100 * (problem.optimum - bound) / problem.optimum:.2f}% below" \
+            if problem.optimum else "unknown"
+        print(f"{problem.name}: bound {bound:.1f} in {time.time() - start_time:.2f}s (optimum {optimum})")
@@ -4,6 +4,10 @@ import random
 import matplotlib.pyplot as plt
 import random
 
+from bounded_cache import BoundedCache
+
+completion_cache_bytes = 16 * 2**20 # Memory cap of each GA run's completion time cache
+
 def calculate_completion_time(schedule, processing_times):
     completion_times = [0] * len(processing_times[0])
     for task in schedule:
@@ -12,6 +16,13 @@ def calculate_completion_time(schedule, processing_times):
     makespan = max(completion_times)
     return makespan, completion_times
 
+def evaluate(schedule, processing_times, cache=None):
+    # calculate_completion_time, memoised in `cache` when given; a cache must only ever see one set of times,
+    #   as it is keyed by the schedule alone
+    if cache is None:
+        return calculate_completion_time(schedule, processing_times)
+    return cache.get_or_compute(tuple(schedule), lambda: calculate_completion_time(schedule, processing_times))
+
 def crossover(parent1, parent2):
     start, end = sorted(random.sample(range(len(parent1)), 2))
     child = [-1] * len(parent1)
@@ -105,19 +116,20 @@ def initialize_population(num_tasks, population_size):
 
 def genetic_algorithm_with_visualization(processing_times, population_size=20, generations=50):
     num_tasks = len(processing_times)
+    cache = BoundedCache(max_bytes=completion_cache_bytes) # This run's times only
     population = initialize_population(num_tasks, population_size)
     best_fitness_per_generation = []
 
     for gen in range(generations):
-        population = sorted(population, key=lambda x: calculate_completion_time(x, processing_times)[0])
+        population = sorted(population, key=lambda x: evaluate(x, processing_times, cache)[0])
         best_schedule = population[0]
-        min_time, completion_times = calculate_completion_time(best_schedule, processing_times)
+        min_time, completion_times = evaluate(best_schedule, processing_times, cache)
         best_fitness_per_generation.append(min_time)
 
         next_population = population[:5]
         while len(next_population) < population_size:
-            parent1 = tournament_selection(population, processing_times)
-            parent2 = tournament_selection(population, processing_times)
+            parent1 = tournament_selection(population, processing_times, cache=cache)
+            parent2 = tournament_selection(population, processing_times, cache=cache)
             child = crossover(parent1, parent2)
             if random.random() < 0.8:
                 child = mutate(child)
@@ -132,35 +144,36 @@ def genetic_algorithm_with_visualization(processing_times, population_size=20, g
             new_individuals = [random.sample(range(num_tasks), num_tasks) for _ in range(population_size - len(top_individuals))]
             population = top_individuals + new_individuals
 
+    print(f"Completion time cache: {cache.stats()}")
     return best_schedule, min_time, completion_times
 
-def rank_selection(population, processing_times):
-    ranked_population = sorted(population, key=lambda x: calculate_completion_time(x, processing_times))
+def rank_selection(population, processing_times, cache=None):
+    ranked_population = sorted(population, key=lambda x: evaluate(x, processing_times, cache))
     probabilities = [1 / (rank + 1) for rank in range(len(ranked_population))]
     total = sum(probabilities)
     probabilities = [p / total for p in probabilities]
     selected_idx = random.choices(range(len(ranked_population)), weights=probabilities, k=1)[0]
     return ranked_population[selected_idx]
 
-def local_search(schedule, processing_times):
+def local_search(schedule, processing_times, cache=None):
     best_schedule = schedule[:]
-    best_fitness = calculate_completion_time(best_schedule, processing_times)
+    best_fitness = evaluate(best_schedule, processing_times, cache)
     for i in range(len(schedule)):
         for j in range(i + 1, len(schedule)):
             neighbor = best_schedule[:]
             neighbor[i], neighbor[j] = neighbor[j], neighbor[i]
-            fitness = calculate_completion_time(neighbor, processing_times)
+            fitness = evaluate(neighbor, processing_times, cache)
             if fitness < best_fitness:
                 best_fitness = fitness
                 best_schedule = neighbor
     return best_schedule
 
-def tournament_selection(population, processing_times, k=3):
+def tournament_selection(population, processing_times, k=3, cache=None):
     tournament = random.sample(population, k)
-    return min(tournament, key=lambda x: calculate_completion_time(x, processing_times))
+    return min(tournament, key=lambda x: evaluate(x, processing_times, cache))
 
-def roulette_wheel_selection(population, processing_times):
-    fitness_scores = [1 / calculate_completion_time(ind, processing_times)[0] for ind in population]
+def roulette_wheel_selection(population, processing_times, cache=None):
+    fitness_scores = [1 / evaluate(ind, processing_times, cache)[0] for ind in population]
     total_fitness = sum(fitness_scores)
     probabilities = [score / total_fitness for score in fitness_scores]
     selected_idx = random.choices(range(len(population)), weights=probabilities, k=1)[0]
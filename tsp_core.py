@@ -0,0 +1,1578 @@
+"""Solver core for the Traveling Salesman app: ACO, GA and local search with no Tk dependency.
+
+Run it directly to solve batches of random instances headless and write tours and metrics as JSON:
+
+    python tsp_core.py --cities 200 500 --seeds 1 2 3 --solver aco ga --time-limit 30 --output results.json
+    python tsp_core.py --tsplib berlin52.tsp kroA100.tsp --solver aco --local-search
+    python tsp_core.py --cities 1000 --solver aco --local-search --stop-gap 3
+"""
+import argparse
+import atexit
+import json
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from multiprocessing import Barrier, Event, Lock, Pool, Process, cpu_count, resource_tracker, shared_memory
+
+import numpy as np
+
+import tsplib
+from crossover import crossovers, edge_assembly_crossover
+from exact import exact_limit, held_karp
+from lower_bound import held_karp_bound
+
+num_ants = 30
+alpha = 1  # Importance of pheromone
+beta = 2   # Importance of heuristic
+evaporation_rate = 0.5 # Rate of pheromone evaporation
+iterations = 100
+generations = 100
+population_size = 30
+num_neighbours = 10 # Size of each city's nearest-neighbour candidate list
+tile_elements = 2**20 # Distance rows are built in tiles of about this many entries to bound temporaries
+dense_limit = 20000 # Above this many cities solve() computes distances on the fly instead of storing them
+cached_rows = 256 # Rows of distances kept by the on-the-fly mode
+pheromone_rules = ("AS", "MMAS", "ACS") # Ant System, MAX-MIN Ant System, Ant Colony System
+p_best = 0.05 # MMAS: probability of rebuilding the best tour once pheromones have converged
+acs_q0 = 0.9 # ACS: probability of taking the best-looking road instead of sampling
+acs_xi = 0.1 # ACS: local pheromone decay applied to every road as an ant crosses it
+crossover_names = tuple(crossovers) + ("EAX",) # EAX replaces the whole generation step, see evolve_eax
+eax_children = 30 # EAX: children tried per pair of parents
+lk_depth = 50 # Lin-Kernighan: most 2-opt moves chained into one improving move
+lk_breadth = 5 # Lin-Kernighan: alternatives tried for the first move of a chain
+lk_time_limit = 10 # Seconds the standalone Lin-Kernighan solver runs when no budget is given
+kick_window = 50 # Chained LK: the double-bridge kick reconnects cities at most this many positions apart
+migration_interval = 10 # Island GA: generations between migrations
+num_migrants = 2 # Island GA: best tours each island sends to the next one per migration
+topologies = ("ring", "random") # Island GA: who receives whose migrants
+bound_time_limit = 5 # Seconds of subgradient optimisation spent on the Held-Karp lower bound
+
+class Progress:
+    """Snapshot a solver hands to its subscriber while it runs."""
+    def __init__(self, solver, iteration, best_tour, best_distance, elapsed, tours=()):
+        self.solver = solver
+        self.iteration = iteration
+        self.best_tour = best_tour
+        self.best_distance = best_distance
+        self.elapsed = elapsed
+        self.tours = tours # Current colony or population, for overlays
+
+class SolveControl:
+    """Pause / resume / cancel switches for a solver running on another thread."""
+    def __init__(self):
+        self.running = threading.Event()
+        self.running.set()
+        self.cancelled = threading.Event()
+        self.paused_for = 0.0 # Seconds spent paused, kept out of the solvers' elapsed time
+
+    def pause(self):
+        self.running.clear()
+
+    def resume(self):
+        self.running.set()
+
+    def cancel(self):
+        self.cancelled.set()
+        self.running.set() # Wake a paused solver so it can stop
+
+    def paused(self):
+        return not self.running.is_set()
+
+    def proceed(self):
+        # Called between iterations: blocks while paused, False once the run is cancelled
+        if self.paused():
+            paused_at = time.time()
+            self.running.wait()
+            self.paused_for += time.time() - paused_at
+        return not self.cancelled.is_set()
+
+def euclidean(a, b):
+    # Elementwise distance between broadcastable (..., 2) coordinate arrays
+    return np.sqrt(np.sum((a - b) ** 2, axis=-1))
+
+def distance_matrix(coordinates, metric=euclidean, dtype=np.float32, tile_rows=None):
+    # Distances between every pair of coordinates, built a block of rows at a time so the temporaries stay
+    #   at tile size and peak memory is close to the N x N result itself
+    coordinates = np.asarray(coordinates, dtype=np.float64)
+    n = len(coordinates)
+    if tile_rows is None:
+        tile_rows = max(1, tile_elements // max(n, 1))
+    distances = np.empty((n, n), dtype=dtype)
+    for start in range(0, n, tile_rows):
+        stop = min(start + tile_rows, n)
+        distances[start:stop] = metric(coordinates[start:stop, None, :], coordinates[None, :, :])
+    return distances
+
+class LazyDistanceMatrix:
+    """Distances computed on demand from coordinates, with a small LRU of recently used rows.
+
+    Indexes like the dense matrix: d[i] is a row, d[i, j] a distance, and d[rows, cols] with index arrays
+    gathers elementwise, so solvers and total_distance work on it unchanged.
+    """
+    def __init__(self, coordinates, metric=euclidean, cache_rows=cached_rows, dtype=np.float32):
+        self.coordinates = np.asarray(coordinates, dtype=np.float64)
+        self.metric = metric
+        self.cache_rows = cache_rows
+        self.dtype = dtype
+        self.shape = (len(self.coordinates), len(self.coordinates))
+        self.rows = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return self.shape[0]
+
+    def row(self, i):
+        i = int(i)
+        cached = self.rows.get(i)
+        if cached is not None:
+            self.rows.move_to_end(i)
+            self.hits += 1
+            return cached
+        self.misses += 1
+        cached = self.metric(self.coordinates[i], self.coordinates).astype(self.dtype)
+        self.rows[i] = cached
+        if len(self.rows) > self.cache_rows:
+            self.rows.popitem(last=False)
+        return cached
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            if np.ndim(key) == 0:
+                return self.row(key)
+            keys = np.asarray(key)
+            return np.stack([self.row(i) for i in keys.ravel()]).reshape(keys.shape + (len(self),))
+
+        i, j = key
+        if isinstance(j, slice):
+            return self[i][..., j]
+        if isinstance(i, slice): # Symmetric, so a column is a row
+            return self[j][..., i]
+        i, j = np.asarray(i), np.asarray(j)
+        if i.ndim == 0:
+            cached = self.rows.get(int(i))
+            if cached is not None:
+                return cached[j]
+            if j.ndim:
+                return self.row(i)[j]
+        return self.metric(self.coordinates[i], self.coordinates[j]).astype(self.dtype)
+
+def instance_distances(problem, lazy=False):
+    # Distances for a TSPLIB instance: its explicit matrix, a tiled dense build or the on-the-fly mode
+    if problem.edge_weight_type == "EXPLICIT":
+        return problem.weights
+    if lazy:
+        return LazyDistanceMatrix(problem.coordinates, problem.metric)
+    return distance_matrix(problem.coordinates, problem.metric)
+
+def random_coordinates(num_cities, seed=None, width=1000, height=1000):
+    # A reproducible random instance, integer coordinates like the UI generates
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.integers(0, width, num_cities), rng.integers(0, height, num_cities)]).astype(np.float64)
+
+def choice_matrix(distance_matrix, pheromones, alpha, beta):
+    # tau^alpha * eta^beta for every road, zero on the diagonal so an ant never stays put
+    heuristic = 1 / np.maximum(distance_matrix, 1e-10) # Inverse distance, guarded for coincident cities
+    choice = (pheromones ** alpha) * (heuristic ** beta)
+    np.fill_diagonal(choice, 0.0)
+    return choice
+
+class LazyChoice:
+    """choice_matrix() for on-the-fly distances: only the rows and entries ants ask for are computed."""
+    def __init__(self, distance_matrix, pheromones, alpha, beta):
+        self.distance_matrix = distance_matrix
+        self.pheromones = pheromones
+        self.alpha = alpha
+        self.beta = beta
+
+    def __len__(self):
+        return len(self.distance_matrix)
+
+    def __getitem__(self, key):
+        heuristic = 1 / np.maximum(self.distance_matrix[key], 1e-10)
+        choice = (self.pheromones[key] ** self.alpha) * (heuristic ** self.beta)
+        if isinstance(key, tuple):
+            choice[np.broadcast_to(key[0] == key[1], choice.shape)] = 0.0
+        else:
+            choice[np.arange(len(key)), key] = 0.0
+        return choice
+
+class CandidatePheromones:
+    """Pheromone kept only on candidate roads: (N, k) levels instead of an N x N matrix, for on-the-fly distances.
+
+    Roads off the candidate lists share one background level that evaporates and is clamped with the rest but
+    never takes a deposit. Indexes like the dense matrix for the reads and writes ACO makes.
+    """
+    def __init__(self, candidates, level=1.0):
+        self.candidates = np.asarray(candidates, dtype=np.int32)
+        self.levels = np.full(self.candidates.shape, float(level))
+        self.background = float(level)
+        self.shape = (len(self.candidates), len(self.candidates))
+
+    def __len__(self):
+        return self.shape[0]
+
+    def locate(self, rows, cols):
+        # Slot of each (row, col) road in its row's candidate list, and whether it is on the list at all
+        matches = self.candidates[rows] == np.asarray(cols)[..., None]
+        return matches.argmax(axis=-1), matches.any(axis=-1)
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            rows, cols = np.broadcast_arrays(*key)
+            slots, found = self.locate(rows, cols)
+            return np.where(found, self.levels[rows, slots], self.background)
+        rows = np.atleast_1d(key) # Whole rows, as LazyChoice asks for them
+        dense = np.full((len(rows), self.shape[1]), self.background)
+        dense[np.arange(len(rows))[:, None], self.candidates[rows]] = self.levels[rows]
+        return dense
+
+    def __setitem__(self, key, values):
+        if isinstance(key, slice): # pheromones[:] = level
+            self.levels[:] = values
+            self.background = float(values)
+            return
+        rows, cols = np.broadcast_arrays(*key)
+        slots, found = self.locate(rows, cols)
+        values = np.broadcast_to(values, rows.shape)
+        self.levels[rows[found], slots[found]] = values[found] # Roads off the lists stay at the background
+
+    def __imul__(self, factor):
+        self.levels *= factor
+        self.background *= factor
+        return self
+
+    def add_at(self, rows, cols, amount):
+        # np.add.at for the candidate roads among (rows, cols)
+        slots, found = self.locate(rows, cols)
+        np.add.at(self.levels, (rows[found], slots[found]), amount)
+
+    def clip(self, low, high):
+        np.clip(self.levels, low, high, out=self.levels)
+        self.background = min(max(self.background, low), high)
+
+class NeighbourIndex:
+    """Uniform grid over the city coordinates answering k-nearest-neighbour queries."""
+    def __init__(self, coordinates, k=num_neighbours):
+        self.coordinates = np.asarray(coordinates, dtype=np.float64)
+        n = len(self.coordinates)
+        self.k = max(min(k, n - 1), 0)
+
+        # About two cities per cell, so a query only has to look at a few rings of cells
+        low = self.coordinates.min(axis=0)
+        span = float((self.coordinates.max(axis=0) - low).max()) or 1.0
+        self.side = max(1, int(np.sqrt(n / 2)))
+        self.cell_size = span / self.side * (1 + 1e-9)
+        cells = np.minimum(((self.coordinates - low) / self.cell_size).astype(np.int64), self.side - 1)
+        self.cell_of = cells[:, 0] * self.side + cells[:, 1]
+        self.order = np.argsort(self.cell_of, kind="stable")
+        self.starts = np.searchsorted(self.cell_of[self.order], np.arange(self.side * self.side + 1))
+        self.neighbours = self.build()
+
+    def cities_in(self, cx0, cx1, cy0, cy1):
+        # Cities in the block of cells [cx0, cx1] x [cy0, cy1], clipped to the grid
+        cx0, cy0 = max(cx0, 0), max(cy0, 0)
+        cx1, cy1 = min(cx1, self.side - 1), min(cy1, self.side - 1)
+        ranges = [self.order[self.starts[cx * self.side + cy0]:self.starts[cx * self.side + cy1 + 1]]
+                  for cx in range(cx0, cx1 + 1)]
+        return np.concatenate(ranges) if ranges else np.empty(0, dtype=np.int64)
+
+    def build(self):
+        # k nearest neighbours of every city, closest first, as an (N, k) int32 array
+        n = len(self.coordinates)
+        neighbours = np.empty((n, self.k), dtype=np.int32)
+        if self.k == 0:
+            return neighbours
+
+        for cell in np.unique(self.cell_of): # All cities of a cell share the same rings
+            members = self.order[self.starts[cell]:self.starts[cell + 1]]
+            cx, cy = divmod(int(cell), self.side)
+            ring = 1
+            while True:
+                found = self.cities_in(cx - ring, cx + ring, cy - ring, cy + ring)
+                if len(found) > self.k or len(found) == n:
+                    diff = self.coordinates[members, None, :] - self.coordinates[None, found, :]
+                    dist = np.sqrt((diff ** 2).sum(axis=2))
+                    dist[members[:, None] == found[None, :]] = np.inf # A city is not its own neighbour
+                    nearest = np.argsort(dist, axis=1)[:, :self.k]
+                    # Anything outside the searched block is at least `ring` cells away
+                    kth = np.take_along_axis(dist, nearest[:, -1:], axis=1)
+                    if len(found) == n or (kth <= ring * self.cell_size).all():
+                        neighbours[members] = found[nearest]
+                        break
+                ring += 1
+        return neighbours
+
+def _roulette(weights, allowed, rng, q0=0.0):
+    # One roulette-wheel pick per row; a row whose weights all underflowed picks uniformly among allowed columns
+    weights = np.where(allowed, weights, 0.0)
+    totals = weights.sum(axis=1)
+    stuck = totals <= 0
+    if stuck.any():
+        weights[stuck] = allowed[stuck]
+        totals[stuck] = weights[stuck].sum(axis=1)
+
+    # First column whose cumulative weight exceeds the pick
+    cumulative = np.cumsum(weights, axis=1)
+    picks = rng.random(len(weights)) * totals
+    picked = np.minimum((cumulative <= picks[:, None]).sum(axis=1), weights.shape[1] - 1)
+    if q0 > 0: # ACS pseudo-random proportional rule: some rows just take their heaviest column
+        greedy = rng.random(len(weights)) < q0
+        picked[greedy] = np.argmax(weights[greedy], axis=1)
+    return picked
+
+def nearest_neighbour_tour(distance_matrix, start=0):
+    # Greedy tour that always moves to the closest unvisited city
+    n = len(distance_matrix)
+    visited = np.zeros(n, dtype=bool)
+    tour = [start]
+    visited[start] = True
+    for _ in range(n - 1):
+        row = np.where(visited, np.inf, distance_matrix[tour[-1]])
+        tour.append(int(np.argmin(row)))
+        visited[tour[-1]] = True
+    return tour
+
+def candidate_tour(distance_matrix, neighbours, start=0):
+    # Nearest-neighbour tour that looks at the candidate lists first and scans a full row only when every
+    #   candidate is already visited, so large instances take O(N k) rather than O(N^2)
+    n = len(distance_matrix)
+    visited = np.zeros(n, dtype=bool)
+    tour = [start]
+    visited[start] = True
+    for _ in range(n - 1):
+        current = tour[-1]
+        following = next((int(c) for c in neighbours[current] if not visited[c]), None)
+        if following is None:
+            following = int(np.argmin(np.where(visited, np.inf, distance_matrix[current])))
+        tour.append(following)
+        visited[following] = True
+    return tour
+
+def construct_tours(choice, num_ants, rng, candidates=None, q0=0.0, on_step=None):
+    # Build the tours of a whole colony at once: one row per ant, one column per step
+    num_cities = len(choice)
+    ants = np.arange(num_ants)
+    tours = np.empty((num_ants, num_cities), dtype=np.int32)
+    visited = np.zeros((num_ants, num_cities), dtype=bool)
+
+    current = rng.integers(0, num_cities, size=num_ants) # Every ant starts from a random city
+    tours[:, 0] = current
+    visited[ants, current] = True
+
+    for step in range(1, num_cities):
+        previous = current
+        if candidates is None:
+            current = _roulette(choice[current], ~visited, rng, q0)
+        else:
+            # Choose among the nearest neighbours; only ants that have visited all of them see every city
+            nearby = candidates[current]
+            allowed = ~visited[ants[:, None], nearby]
+            open_rows = allowed.any(axis=1)
+            following = np.empty(num_ants, dtype=np.int64)
+            rows = np.flatnonzero(open_rows)
+            picked = _roulette(choice[current[rows, None], nearby[rows]], allowed[rows], rng, q0)
+            following[rows] = nearby[rows, picked]
+            rows = np.flatnonzero(~open_rows)
+            if len(rows):
+                following[rows] = _roulette(choice[current[rows]], ~visited[rows], rng, q0)
+            current = following
+
+        tours[:, step] = current
+        visited[ants, current] = True
+        if on_step is not None: # Lets ACS decay the roads just taken before the next step
+            on_step(previous, current)
+
+    return tours
+
+def _reverse(tour, pos, i, j):
+    # Reverse the cities at positions i..j (inclusive, wrapping); flips the shorter side of the cycle
+    n = len(tour)
+    length = (j - i) % n + 1
+    if 2 * length > n:
+        i, j, length = (j + 1) % n, (i - 1) % n, n - length
+    for _ in range(length // 2):
+        a, b = tour[i], tour[j]
+        tour[i], tour[j] = b, a
+        pos[b], pos[a] = i, j
+        i = (i + 1) % n
+        j = (j - 1) % n
+
+def _two_opt(tour, pos, d, neighbours, a):
+    # First-improvement 2-opt from city a over both of its tour edges
+    n = len(tour)
+    for forward in (True, False):
+        if forward:
+            a_next = tour[(pos[a] + 1) % n]
+        else:
+            a_next = tour[pos[a] - 1]
+        d_a = d[a][a_next]
+        for c in neighbours[a]:
+            g1 = d_a - d[a][c]
+            if g1 <= 0: # Neighbours are sorted, no later one can gain either
+                break
+            if forward:
+                c_next = tour[(pos[c] + 1) % n]
+            else:
+                c_next = tour[pos[c] - 1]
+            if c_next == a:
+                continue
+            delta = g1 + d[c][c_next] - d[a_next][c_next]
+            if delta > 1e-9:
+                if forward: # a a_next ... c c_next  ->  a c ... a_next c_next
+                    _reverse(tour, pos, pos[a_next], pos[c])
+                else: # c_next c ... a_next a  ->  c_next a_next ... c a
+                    _reverse(tour, pos, pos[c], pos[a_next])
+                return (a, a_next, c, c_next)
+    return None
+
+def _or_opt(tour, pos, d, neighbours, a, max_segment):
+    # Move the segment of up to max_segment cities starting at a next to one of its neighbours
+    n = len(tour)
+    for length in range(1, max_segment + 1):
+        if length + 3 > n:
+            break
+        first = a
+        last = tour[(pos[a] + length - 1) % n]
+        before = tour[pos[first] - 1]
+        after = tour[(pos[last] + 1) % n]
+        removal = d[before][first] + d[last][after] - d[before][after]
+        if removal <= 1e-9:
+            continue
+        inside = {tour[(pos[a] + s) % n] for s in range(length)}
+
+        best = None
+        for end in (first, last):
+            for c in neighbours[end]:
+                if d[end][c] >= removal:
+                    break
+                if c in inside:
+                    continue
+                # Try the edges on both sides of c, with the segment in either orientation
+                for u, v in ((c, tour[(pos[c] + 1) % n]), (tour[pos[c] - 1], c)):
+                    if v in inside or u in inside:
+                        continue
+                    base = d[u][v]
+                    keep = d[u][first] + d[last][v] - base
+                    flip = d[u][last] + d[first][v] - base
+                    gain = removal - min(keep, flip)
+                    if gain > 1e-9 and (best is None or gain > best[0]):
+                        best = (gain, u, v, flip < keep)
+        if best is None:
+            continue
+
+        _, u, v, reverse = best
+        # Rotate so the segment leads, cut it out and splice it back in after u
+        start = pos[first]
+        rotated = tour[start:] + tour[:start]
+        segment, rest = rotated[:length], rotated[length:]
+        if reverse:
+            segment.reverse()
+        cut = (pos[u] - start) % n - length + 1
+        tour[:] = rest[:cut] + segment + rest[cut:]
+        for i, city in enumerate(tour):
+            pos[city] = i
+        return (before, after, first, last, u, v)
+    return None
+
+def search_tables(distance_matrix, neighbours):
+    # Nested lists are faster to index; large or on-the-fly matrices are indexed row by row instead. Lists
+    #   pass through unchanged, so a solver running many searches converts once and hands the result back in
+    n = len(distance_matrix)
+    d = distance_matrix.tolist() if isinstance(distance_matrix, np.ndarray) and n <= 2000 else distance_matrix
+    neighbours = neighbours.tolist() if hasattr(neighbours, "tolist") else neighbours
+    return d, neighbours
+
+def local_search(tour, distance_matrix, neighbours, use_or_opt=True, max_segment=3):
+    # 2-opt and Or-opt over the candidate lists with don't-look bits; every move is evaluated in O(1)
+    n = len(tour)
+    tour = [int(city) for city in tour]
+    if n < 5:
+        return tour
+    d, neighbours = search_tables(distance_matrix, neighbours)
+    pos = [0] * n
+    for i, city in enumerate(tour):
+        pos[city] = i
+
+    queue = deque(tour)
+    queued = [True] * n # Don't-look bits: a city leaves the queue until a move touches it again
+    while queue:
+        a = queue.popleft()
+        queued[a] = False
+        touched = _two_opt(tour, pos, d, neighbours, a)
+        if touched is None and use_or_opt:
+            touched = _or_opt(tour, pos, d, neighbours, a, max_segment)
+        if touched is not None:
+            for city in touched + (a,):
+                if not queued[city]:
+                    queued[city] = True
+                    queue.append(city)
+    return tour
+
+def _move(tour, pos, t1, t2, t3, t4):
+    # Replace roads (t1, t2) and (t4, t3) by (t2, t3) and (t1, t4), where t2 follows t1 and t4 precedes t3 in
+    #   one direction of travel: the path t2 .. t4 is reversed. _move(t1, t4, t3, t2) undoes it
+    n = len(tour)
+    if tour[(pos[t1] + 1) % n] == t2:
+        _reverse(tour, pos, pos[t2], pos[t4])
+    else:
+        _reverse(tour, pos, pos[t4], pos[t2])
+
+def _lin_kernighan(tour, pos, d, neighbours, t1, max_depth, breadth):
+    # Variable-depth move from t1: a chain of 2-opt moves, each removing the road the previous one left open,
+    #   kept while the running gain stays positive; the best prefix of the chain is applied. Returns the
+    #   cities it touched, or None when no chain from t1 shortens the tour
+    n = len(tour)
+    for t2 in (tour[(pos[t1] + 1) % n], tour[pos[t1] - 1]):
+        for first in range(breadth):
+            moves = []
+            added = set()
+            gain_open = d[t1][t2] # Removed minus added, not counting the road that would close the tour
+            best_gain, best_length = 1e-9, 0
+            t2_current = t2
+            for depth in range(max_depth):
+                forward = tour[(pos[t1] + 1) % n] == t2_current
+                options = []
+                for t3 in neighbours[t2_current]:
+                    g1 = gain_open - d[t2_current][t3]
+                    if g1 <= 0: # Neighbours are sorted, no later one keeps the gain positive
+                        break
+                    t4 = tour[pos[t3] - 1] if forward else tour[(pos[t3] + 1) % n]
+                    if t3 == t1 or t4 == t2_current or t3 == tour[pos[t2_current] - 1 if forward else
+                                                                  (pos[t2_current] + 1) % n]:
+                        continue
+                    if (min(t3, t4), max(t3, t4)) in added:
+                        continue
+                    options.append((g1 + d[t3][t4], t3, t4))
+                if depth == 0:
+                    options.sort(reverse=True)
+                    if first >= len(options):
+                        break
+                    choice = options[first]
+                elif options:
+                    choice = max(options)
+                else:
+                    break
+                gain_open, t3, t4 = choice
+                _move(tour, pos, t1, t2_current, t3, t4)
+                moves.append((t2_current, t3, t4))
+                added.add((min(t2_current, t3), max(t2_current, t3)))
+                if gain_open - d[t4][t1] > best_gain:
+                    best_gain, best_length = gain_open - d[t4][t1], len(moves)
+                t2_current = t4
+
+            for t2_move, t3, t4 in reversed(moves[best_length:]):
+                _move(tour, pos, t1, t4, t3, t2_move)
+            if best_length:
+                return [t1] + [city for move in moves[:best_length] for city in move]
+            if not moves:
+                break # No first move at this breadth, so none at a larger one either
+    return None
+
+def _tour_length(tour, d):
+    return sum(float(d[tour[i - 1]][tour[i]]) for i in range(len(tour))) # float64 even on float32 matrices
+
+def lin_kernighan(tour, distance_matrix, neighbours, time_limit=None, max_depth=lk_depth, breadth=lk_breadth,
+                  seed=None, control=None, on_progress=None, progress_interval=10):
+    # Lin-Kernighan style improvement over the candidate lists, with Or-opt for segment moves. Given a time
+    #   budget it keeps going as chained LK: kick the tour with a local double bridge, re-optimise around the
+    #   kick and keep the result when it is shorter
+    n = len(tour)
+    tour = [int(city) for city in tour]
+    if n < 8:
+        return local_search(tour, distance_matrix, neighbours)
+    start_time = time.time()
+    d, neighbours = search_tables(distance_matrix, neighbours)
+    rng = random.Random(seed)
+    pos = [0] * n
+    for i, city in enumerate(tour):
+        pos[city] = i
+
+    def optimise(queue):
+        queued = [False] * n
+        for city in queue:
+            queued[city] = True
+        while queue:
+            a = queue.popleft()
+            queued[a] = False
+            touched = _lin_kernighan(tour, pos, d, neighbours, a, max_depth, breadth)
+            if touched is None:
+                touched = _or_opt(tour, pos, d, neighbours, a, 3)
+            if touched is not None:
+                for city in tuple(touched) + (a,):
+                    if not queued[city]:
+                        queued[city] = True
+                        queue.append(city)
+
+    optimise(deque(tour))
+    if time_limit is None:
+        return tour
+
+    best, best_length = tour[:], _tour_length(tour, d)
+    window = min(kick_window, n - 1)
+    kicks = 0
+    while time.time() - start_time < time_limit:
+        if control is not None and not control.proceed():
+            break
+        if on_progress is not None and kicks % progress_interval == 0:
+            on_progress(Progress("LK", kicks, best, best_length, time.time() - start_time))
+        kicks += 1
+        # Double bridge on a short stretch: A B C D -> A C B D with B and C within `window` positions
+        start = rng.randrange(n)
+        j, k, l = sorted(rng.sample(range(1, window + 1), 3))
+        rotated = tour[start:] + tour[:start]
+        tour[:] = rotated[:j] + rotated[k:l] + rotated[j:k] + rotated[l:]
+        for i, city in enumerate(tour):
+            pos[city] = i
+        optimise(deque(rotated[i] for i in (0, j - 1, j, k - 1, k, l - 1, l % n, -1)))
+
+        length = _tour_length(tour, d)
+        if length < best_length - 1e-9:
+            best, best_length = tour[:], length
+        else:
+            tour[:] = best
+            for i, city in enumerate(tour):
+                pos[city] = i
+    return best
+
+def polish(tour, distance, distance_matrix, neighbours, time_limit, control=None):
+    # Optional Lin-Kernighan stage after a solver: returns the tour and its length, unchanged without a budget
+    if not time_limit or tour is None:
+        return tour, distance
+    tour = lin_kernighan(tour, distance_matrix, neighbours, time_limit, control=control)
+    return tour, float(distance_matrix[tour, np.roll(tour, -1)].sum(dtype=np.float64))
+
+def instance_bound(distance_matrix, candidates, time_limit=bound_time_limit, control=None):
+    # Held-Karp lower bound on the optimal tour, using a candidate-list tour to size the subgradient steps
+    tour = candidate_tour(distance_matrix, candidates)
+    upper_bound = float(distance_matrix[tour, np.roll(tour, -1)].sum(dtype=np.float64))
+    return held_karp_bound(distance_matrix, upper_bound, time_limit=time_limit, control=control)[0]
+
+class Solver:
+    """Clock and stop checks shared by the solvers; subclasses set the attributes their constructors take."""
+    time_limit = None # Optional wall-clock budget in seconds
+    control = None # Optional SolveControl to pause or cancel the run
+    lower_bound = target_gap = target_distance = stagnation = None # See _stop_reason
+    tables = None # search_tables() of the instance, built on first use
+
+    def start_clock(self):
+        self.start_time = time.time()
+        self.paused_before = self.control.paused_for if self.control is not None else 0.0
+
+    def elapsed(self):
+        # Seconds spent solving, not counting time paused during this run
+        paused = self.control.paused_for - self.paused_before if self.control is not None else 0.0
+        return time.time() - self.start_time - paused
+
+    def out_of_time(self):
+        # Wall-clock budget shared by all the run loops
+        return self.time_limit is not None and self.elapsed() >= self.time_limit
+
+    def search_tables(self, candidates):
+        # The local search's list form of the distances and candidates, converted once per solver instead of on
+        #   every call
+        if self.tables is None:
+            self.tables = search_tables(self.distance_matrix, candidates)
+        return self.tables
+
+    def stopped(self, best_distance, stagnant):
+        # Checked before every iteration; waits here while the run is paused and records why it stops
+        if self.control is not None and not self.control.proceed():
+            self.stop_reason = "cancelled"
+            return True
+        reason = _stop_reason(self, best_distance, stagnant)
+        if reason is not None:
+            self.stop_reason = reason
+        return reason is not None
+
+class LinKernighan(Solver):
+    """Standalone chained Lin-Kernighan solver from a nearest-neighbour start, for a fixed time budget."""
+    def __init__(self, distance_matrix, candidates=None, time_limit=10, control=None):
+        self.distance_matrix = distance_matrix
+        self.candidates = candidates if candidates is not None else nearest_neighbours(distance_matrix)
+        self.time_limit = time_limit
+        self.control = control
+        self.start_time = None
+        self.iterations_run = 0 # Kicks tried
+        self.stop_reason = None
+
+    def run(self, on_progress=None, progress_interval=10):
+        self.start_clock()
+        def report(progress):
+            self.iterations_run = progress.iteration
+            progress.elapsed = self.elapsed()
+            if on_progress is not None:
+                on_progress(progress)
+
+        tour = candidate_tour(self.distance_matrix, self.candidates, random.randrange(len(self.distance_matrix)))
+        tour = lin_kernighan(tour, self.distance_matrix, self.candidates, self.time_limit, control=self.control,
+                             on_progress=report, progress_interval=progress_interval)
+        cancelled = self.control is not None and self.control.cancelled.is_set()
+        self.stop_reason = "cancelled" if cancelled else "time limit"
+        return tour, float(self.distance_matrix[tour, np.roll(tour, -1)].sum(dtype=np.float64))
+
+class ExactSolver(Solver):
+    """Held-Karp dynamic programming: the optimal tour for instances of up to exact_limit cities."""
+    def __init__(self, distance_matrix, control=None):
+        self.distance_matrix = distance_matrix
+        self.control = control
+        self.start_time = None
+        self.iterations_run = 0
+        self.stop_reason = None
+
+    def run(self, on_progress=None, progress_interval=10):
+        # One exact solve; returns (None, inf) when cancelled, as there is no partial tour to show
+        self.start_clock()
+        tour, length = held_karp(self.distance_matrix, self.control)
+        self.iterations_run = int(tour is not None)
+        self.stop_reason = "optimal" if tour is not None else "cancelled"
+        return tour, length
+
+_worker_buffers = {} # Shared memory blocks attached by a pool worker, keyed by name
+
+def nearest_neighbours(distance_matrix, k=num_neighbours):
+    # Candidate lists straight from a distance matrix, for callers without a NeighbourIndex
+    if isinstance(distance_matrix, LazyDistanceMatrix): # Never materialise the on-the-fly matrix
+        return NeighbourIndex(distance_matrix.coordinates, k).neighbours
+    k = min(k, len(distance_matrix) - 1)
+    masked = np.array(distance_matrix, dtype=np.float64)
+    np.fill_diagonal(masked, np.inf)
+    nearest = np.argpartition(masked, k - 1, axis=1)[:, :k] if k > 0 else np.empty((len(masked), 0), dtype=np.int64)
+    order = np.argsort(np.take_along_axis(masked, nearest, axis=1), axis=1)
+    return np.take_along_axis(nearest, order, axis=1).astype(np.int32)
+
+def _attach_shared(name, shape, dtype=np.float64):
+    if name not in _worker_buffers:
+        _worker_buffers[name] = shared_memory.SharedMemory(name=name)
+    return np.ndarray(shape, dtype=dtype, buffer=_worker_buffers[name].buf)
+
+def _share(array):
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    view = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+    view[:] = array
+    return block, view
+
+def _colony_task(args):
+    # Runs in a pool worker: build a slice of the colony from the choice matrix the parent shared
+    choice_name, candidate_name, shape, k, num_ants, seed = args
+    for name in list(_worker_buffers): # Drop blocks left over from a previous run
+        if name not in (choice_name, candidate_name):
+            _worker_buffers.pop(name).close()
+    choice = _attach_shared(choice_name, shape)
+    candidates = None
+    if candidate_name is not None:
+        candidates = _attach_shared(candidate_name, (shape[0], k), np.int32)
+    return construct_tours(choice, num_ants, np.random.default_rng(seed), candidates)
+
+class ColonyPool:
+    """Long-lived worker pool; the choice matrix travels through shared memory, only tours come back."""
+    def __init__(self, processes=None):
+        self.processes = processes or cpu_count()
+        resource_tracker.ensure_running() # Workers must share our tracker, or they report our blocks as leaked
+        self.pool = Pool(self.processes)
+        self.blocks = []
+
+    def share(self, array):
+        # Copy an array into a new shared memory block and return a view on it
+        block, view = _share(array)
+        self.blocks.append(block)
+        return block, view
+
+    def attach(self, aco):
+        # Shared blocks for the colony's choice matrix, rebuilt by the parent every iteration, and its candidate
+        #   lists. The distances stay private in their own dtype: all the workers need is the choice matrix, and
+        #   its distance half, eta^beta, is fixed for the run
+        n = aco.num_cities
+        self.choice_block = shared_memory.SharedMemory(create=True, size=max(n * n * 8, 1))
+        self.blocks.append(self.choice_block)
+        self.choice = np.ndarray((n, n), dtype=np.float64, buffer=self.choice_block.buf)
+        self.visibility = (1 / np.maximum(np.asarray(aco.distance_matrix), 1e-10)) ** aco.beta
+        self.candidate_block = None
+        if aco.candidates is not None:
+            self.candidate_block, _ = self.share(np.asarray(aco.candidates, dtype=np.int32))
+
+    def detach(self, aco):
+        # Free the shared blocks
+        del self.choice, self.visibility
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def construct_tours(self, aco, rng):
+        # Build this iteration's choice matrix once, in place in shared memory, then split the ants across the
+        #   workers and stack the tours they send back
+        np.power(aco.pheromones, aco.alpha, out=self.choice)
+        self.choice *= self.visibility
+        np.fill_diagonal(self.choice, 0.0)
+        chunks = [len(c) for c in np.array_split(np.arange(aco.num_ants), self.processes) if len(c)]
+        candidate_name = self.candidate_block.name if self.candidate_block is not None else None
+        k = aco.candidates.shape[1] if aco.candidates is not None else 0
+        tasks = [(self.choice_block.name, candidate_name, self.choice.shape, k, size,
+                  int(rng.integers(0, 2**32 - 1))) for size in chunks]
+        return np.vstack(self.pool.map(_colony_task, tasks))
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+_colony_pool = None
+
+def get_colony_pool():
+    # The pool is created on first use and reused by every later run
+    global _colony_pool
+    if _colony_pool is None:
+        _colony_pool = ColonyPool()
+        atexit.register(_colony_pool.close)
+    return _colony_pool
+
+def _stop_reason(solver, best_distance, stagnant):
+    # Stop conditions shared by ACO, GA and the island model, checked before each iteration: the reason to
+    #   stop now, or None to keep going. `stagnant` counts iterations since the best tour last improved.
+    #   Until there is a tour nothing stops the run, so a zero budget still returns one
+    if not np.isfinite(best_distance):
+        return None
+    if solver.out_of_time():
+        return "time limit"
+    if solver.target_distance is not None and best_distance <= solver.target_distance:
+        return "target distance"
+    if solver.target_gap is not None and solver.lower_bound and \
+            tsplib.gap(best_distance, solver.lower_bound) <= solver.target_gap:
+        return "bound gap"
+    if solver.stagnation is not None and stagnant >= solver.stagnation:
+        return "stagnation"
+    return None
+
+def _stack_roads(road_arrays):
+    # One (num_roads, 2) int32 array from the per-iteration arrays an ACO run collected
+    if not road_arrays:
+        return np.empty((0, 2), dtype=np.int32)
+    return np.concatenate(road_arrays)
+
+class ACO(Solver):
+    def __init__(self, distance_matrix, num_ants, alpha, beta, evaporation_rate, iterations, batched=True,
+                 parallel=False, candidates=None, local_search=False, pheromone_rule="AS", deposit="global",
+                 time_limit=None, control=None, polish_time=None, lower_bound=None, target_gap=None,
+                 target_distance=None, stagnation=None, collect_roads=False):
+        # Initialize ACO parameters and pheromone matrix
+        self.distance_matrix = distance_matrix
+        self.num_cities = len(distance_matrix)
+        self.num_ants = num_ants
+        self.alpha = alpha
+        self.beta = beta
+        self.evaporation_rate = evaporation_rate
+        self.iterations = iterations
+        self.batched = batched # Build all tours of an iteration together instead of one ant per task
+        self.parallel = parallel # Spread the batched colony over the shared worker pool
+        self.candidates = candidates # Optional (N, k) nearest-neighbour lists restricting each step
+        self.local_search = local_search # Polish each iteration's best ant with 2-opt / Or-opt
+        self.pheromone_rule = pheromone_rule # "AS", "MMAS" or "ACS", used by the batched colony
+        self.deposit = deposit # MMAS: reinforce the "iteration" best or the "global" best tour
+        self.time_limit = time_limit # Optional wall-clock budget in seconds
+        self.control = control # Optional SolveControl to pause or cancel the run
+        self.polish_time = polish_time # Seconds of Lin-Kernighan on the final tour, if any
+        self.lower_bound = lower_bound # Held-Karp bound, see instance_bound
+        self.target_gap = target_gap # Stop once the best tour is within this many percent of lower_bound
+        self.target_distance = target_distance # Stop once the best tour is this short
+        self.stagnation = stagnation # Stop after this many iterations without a shorter tour
+        self.collect_roads = collect_roads # Return every road the ants tested; num_ants * N per iteration
+        self.stop_reason = None # Why the last run stopped: "iterations", "time limit", "cancelled", ...
+        self.start_time = None
+        self.iterations_run = 0
+        if isinstance(distance_matrix, LazyDistanceMatrix):
+            # On-the-fly distances exist to avoid N x N memory, so pheromone lives on the candidate roads only
+            self.pheromones = CandidatePheromones(self.neighbours())
+        else:
+            self.pheromones = np.ones((self.num_cities, self.num_cities))
+        self.tau_min, self.tau_max = 0.0, np.inf
+        self.tau0 = None
+        self.choice = None
+        if pheromone_rule == "ACS":
+            # ACS starts every road at 1 / (N * L_nn) and decays crossed roads back toward it
+            self.tau0 = 1.0 / (self.num_cities * self.total_distance(nearest_neighbour_tour(distance_matrix)))
+            self.pheromones[:] = self.tau0
+
+    def choice_matrix(self):
+        if not isinstance(self.distance_matrix, np.ndarray):
+            return LazyChoice(self.distance_matrix, self.pheromones, self.alpha, self.beta)
+        return choice_matrix(self.distance_matrix, self.pheromones, self.alpha, self.beta)
+
+    def construct_tours(self, rng):
+        # Build every ant's tour for one iteration as a (num_ants, num_cities) array
+        if self.pheromone_rule != "ACS":
+            return construct_tours(self.choice_matrix(), self.num_ants, rng, self.candidates)
+        self.choice = self.choice_matrix()
+        return construct_tours(self.choice, self.num_ants, rng, self.candidates, acs_q0, self.local_update)
+
+    def local_update(self, start, end):
+        # ACS local rule on the roads the ants just took, in both directions, plus their choice weights
+        rows, cols = np.concatenate([start, end]), np.concatenate([end, start])
+        self.pheromones[rows, cols] = (1 - acs_xi) * self.pheromones[rows, cols] + acs_xi * self.tau0
+        if not isinstance(self.choice, np.ndarray): # LazyChoice reads the pheromones as they are
+            return
+        heuristic = 1 / np.maximum(self.distance_matrix[rows, cols], 1e-10)
+        self.choice[rows, cols] = (self.pheromones[rows, cols] ** self.alpha) * (heuristic ** self.beta)
+
+    def neighbours(self):
+        # Candidate lists for local search, derived from the distances when none were given
+        if self.candidates is None:
+            self.candidates = nearest_neighbours(self.distance_matrix)
+        return self.candidates
+
+    def tour_lengths(self, tours):
+        # Length of every tour in a (num_tours, num_cities) array in one gather, summed in float64 so lengths
+        #   compare exactly with optima and targets computed in float64
+        return self.distance_matrix[tours, np.roll(tours, -1, axis=1)].sum(axis=1, dtype=np.float64)
+
+    def probability(self, current_city, unvisited):
+        # Calculate the probability of moving to each unvisited city
+        unvisited = list(unvisited)
+        pheromones = np.array([self.pheromones[current_city, i] for i in unvisited])
+        distances = np.array([self.distance_matrix[current_city, i] for i in unvisited])
+        heuristic = 1 / distances # Inverse distance
+        denom = np.sum((pheromones ** self.alpha) * (heuristic ** self.beta))
+        probs = (pheromones ** self.alpha) * (heuristic ** self.beta) / denom
+        return probs.tolist()
+
+    def __getstate__(self):
+        # pool.map(self.simulate_ant, ...) pickles the colony; the SolveControl's events cannot be, and the ants
+        #   never need them
+        state = self.__dict__.copy()
+        state["control"] = None
+        state["tables"] = None # Nested lists of the whole matrix would be pickled with every map
+        return state
+
+    def simulate_ant(self, seed):
+        # Simulate a single ant's tour and return the roads tested
+        random.seed(seed)
+        tour = [random.randint(0, self.num_cities - 1)] # Start from a random city
+        unvisited = set(range(self.num_cities)) - {tour[0]}
+        tested_roads = []  # Collect roads tested by the ant
+
+        while unvisited:
+            current_city = tour[-1]
+            probs = self.probability(current_city, unvisited) # Probabilities for next city
+            next_city = random.choices(list(unvisited), weights=probs, k=1)[0]
+            tour.append(next_city)
+            unvisited.remove(next_city)
+
+            # Record the road being tested
+            tested_roads.append((current_city, next_city))
+
+        return tour, self.total_distance(tour), tested_roads
+
+    def update_pheromones(self, best_tour, best_distance):
+        # Update the pheromone levels based on the best tour
+        self.pheromones *= (1 - self.evaporation_rate) # Evaporate pheromones
+        for i in range(len(best_tour)):
+            start_city = best_tour[i]
+            end_city = best_tour[(i + 1) % len(best_tour)]
+            self.pheromones[start_city, end_city] += 1.0 / best_distance # Reinforce best path
+
+    def deposit_on(self, tour, amount):
+        # Add pheromone to every road of a tour in both directions with a single scatter-add
+        tour = np.asarray(tour)
+        following = np.roll(tour, -1)
+        rows, cols = np.concatenate([tour, following]), np.concatenate([following, tour])
+        if isinstance(self.pheromones, CandidatePheromones):
+            self.pheromones.add_at(rows, cols, amount)
+        else:
+            np.add.at(self.pheromones, (rows, cols), amount)
+
+    def update_mmas(self, iteration_tour, iteration_distance, best_tour, best_distance):
+        # MAX-MIN Ant System: evaporate, deposit on one tour, then clamp every road into [tau_min, tau_max]
+        n = self.num_cities
+        self.tau_max = 1.0 / (self.evaporation_rate * best_distance)
+        root = p_best ** (1.0 / n)
+        self.tau_min = self.tau_max * (1 - root) / max((n / 2 - 1) * root, 1.0)
+        if self.tau0 is None: # Start at the upper bound so early iterations explore
+            self.tau0 = self.tau_max
+            self.pheromones[:] = self.tau_max
+
+        self.pheromones *= (1 - self.evaporation_rate)
+        if self.deposit == "iteration":
+            self.deposit_on(iteration_tour, 1.0 / iteration_distance)
+        else:
+            self.deposit_on(best_tour, 1.0 / best_distance)
+        if isinstance(self.pheromones, CandidatePheromones):
+            self.pheromones.clip(self.tau_min, self.tau_max)
+        else:
+            np.clip(self.pheromones, self.tau_min, self.tau_max, out=self.pheromones)
+
+    def update_acs(self, best_tour, best_distance):
+        # Ant Colony System global rule: only the best tour's roads evaporate and receive pheromone
+        tour = np.asarray(best_tour)
+        following = np.roll(tour, -1)
+        rows, cols = np.concatenate([tour, following]), np.concatenate([following, tour])
+        self.pheromones[rows, cols] *= (1 - self.evaporation_rate)
+        self.deposit_on(best_tour, self.evaporation_rate / best_distance)
+
+    def apply_pheromone_rule(self, iteration_tour, iteration_distance, best_tour, best_distance):
+        if self.pheromone_rule == "MMAS":
+            self.update_mmas(iteration_tour, iteration_distance, best_tour, best_distance)
+        elif self.pheromone_rule == "ACS":
+            self.update_acs(best_tour, best_distance)
+        else:
+            self.update_pheromones(best_tour, best_distance)
+
+    def total_distance(self, tour):
+        # Calculate the total distance of a given tour, summed in float64 like tour_lengths
+        tour = np.asarray(tour)
+        return float(self.distance_matrix[tour, np.roll(tour, -1)].sum(dtype=np.float64))
+
+    def run(self, on_progress=None, progress_interval=10):
+        # Solve and return (best_tour, best_distance, tested_roads); on_progress receives a Progress event
+        #   every `progress_interval` iterations, which is all a UI needs to draw the run. tested_roads is an
+        #   (num_roads, 2) int32 array, empty unless the ACO was built with collect_roads=True
+        self.start_clock()
+        self.iterations_run = 0
+        if self.batched:
+            return self.run_batched(on_progress, progress_interval)
+
+        best_tour = None
+        best_distance = float("inf")
+        all_tested_roads = []  # Per-iteration int32 arrays of tested roads, when collecting them
+
+        pool = get_colony_pool().pool # Reuse the long-lived workers instead of a Pool per run
+        self.stop_reason, stagnant = "iterations", 0
+        for iteration in range(self.iterations):
+            if self.stopped(best_distance, stagnant):
+                break
+            seeds = [random.randint(0, 10000) for _ in range(self.num_ants)]
+            results = pool.map(self.simulate_ant, seeds)
+
+            stagnant += 1
+            for tour, tour_distance, tested_roads in results:
+                if self.collect_roads:
+                    all_tested_roads.append(np.array(tested_roads, dtype=np.int32).reshape(-1, 2))
+                if tour_distance < best_distance:
+                    best_distance = tour_distance
+                    best_tour = tour
+                    stagnant = 0
+
+            self.update_pheromones(best_tour, best_distance)
+            self.iterations_run = iteration + 1
+
+            if on_progress is not None and iteration % progress_interval == 0:
+                on_progress(Progress("ACO", iteration, best_tour, best_distance, self.elapsed(),
+                                     [tour for tour, _, _ in results]))
+
+        best_tour, best_distance = polish(best_tour, best_distance, self.distance_matrix, self.neighbours(),
+                                          self.polish_time, self.control)
+        return best_tour, best_distance, _stack_roads(all_tested_roads)
+
+    def run_batched(self, on_progress=None, progress_interval=10):
+        # Same loop as run(), but each iteration builds the whole colony at once
+        # ACS local updates need one shared colony, and on-the-fly distances cannot be shared
+        if not self.parallel or self.pheromone_rule == "ACS" or not isinstance(self.distance_matrix, np.ndarray):
+            return self.run_colony(self.construct_tours, on_progress, progress_interval)
+
+        pool = get_colony_pool()
+        pool.attach(self)
+        try:
+            return self.run_colony(lambda rng: pool.construct_tours(self, rng), on_progress, progress_interval)
+        finally:
+            pool.detach(self)
+
+    def run_colony(self, build_tours, on_progress, progress_interval):
+        best_tour = None
+        best_distance = float("inf")
+        all_tested_roads = []
+        rng = np.random.default_rng(random.randint(0, 2**32 - 1))
+
+        self.stop_reason, stagnant = "iterations", 0
+        for iteration in range(self.iterations):
+            if self.stopped(best_distance, stagnant):
+                break
+            tours = build_tours(rng)
+            lengths = self.tour_lengths(tours)
+
+            # Roads tested by each ant: consecutive cities of its tour (no closing road, as in simulate_ant)
+            if self.collect_roads:
+                all_tested_roads.append(np.stack([tours[:, :-1].ravel(), tours[:, 1:].ravel()], axis=1)
+                                        .astype(np.int32))
+
+            best_ant = int(np.argmin(lengths))
+            if self.local_search:
+                tours[best_ant] = local_search(tours[best_ant], *self.search_tables(self.neighbours()))
+                lengths[best_ant] = self.total_distance(tours[best_ant])
+            stagnant += 1
+            if lengths[best_ant] < best_distance:
+                best_distance = float(lengths[best_ant])
+                best_tour = tours[best_ant].tolist()
+                stagnant = 0
+
+            self.apply_pheromone_rule(tours[best_ant], lengths[best_ant], best_tour, best_distance)
+            self.iterations_run = iteration + 1
+
+            if on_progress is not None and iteration % progress_interval == 0:
+                on_progress(Progress("ACO", iteration, best_tour, best_distance, self.elapsed(), tours))
+
+        best_tour, best_distance = polish(best_tour, best_distance, self.distance_matrix, self.neighbours(),
+                                          self.polish_time, self.control)
+        return best_tour, best_distance, _stack_roads(all_tested_roads)
+
+class GeneticAlgorithm(Solver):
+    """Permutation GA over city tours, with the population held as one (pop, N) int32 array."""
+    def __init__(self, distance_matrix, candidates=None, population_size=population_size, generations=generations,
+                 local_search=False, time_limit=None, control=None, crossover="OX", polish_time=None,
+                 lower_bound=None, target_gap=None, target_distance=None, stagnation=None):
+        self.distance_matrix = distance_matrix
+        self.num_cities = len(distance_matrix)
+        self.candidates = candidates if candidates is not None else nearest_neighbours(distance_matrix)
+        self.population_size = population_size
+        self.generations = generations
+        self.local_search = local_search # Polish every child with 2-opt / Or-opt
+        self.time_limit = time_limit # Optional wall-clock budget in seconds
+        self.control = control # Optional SolveControl to pause or cancel the run
+        self.polish_time = polish_time # Seconds of Lin-Kernighan on the final tour, if any
+        self.lower_bound = lower_bound # Held-Karp bound, see instance_bound
+        self.target_gap = target_gap # Stop once the best tour is within this many percent of lower_bound
+        self.target_distance = target_distance # Stop once the best tour is this short
+        self.stagnation = stagnation # Stop after this many generations without a shorter tour
+        self.stop_reason = None # Why the last run stopped: "generations", "time limit", "cancelled", ...
+        self.eax = crossover == "EAX"
+        self.crossover = crossovers.get(crossover) # OX, PMX, CX or ERX; EAX uses its own generation step
+        self.start_time = None
+        self.iterations_run = 0
+
+    def total_distance(self, tour):
+        # Calculate the total distance of a tour, summed in float64 like tour_lengths
+        tour = np.asarray(tour)
+        return float(self.distance_matrix[tour, np.roll(tour, -1)].sum(dtype=np.float64))
+
+    def tour_lengths(self, population):
+        # Lengths of every tour in one gather: row i's roads are population[i, k] -> population[i, k + 1]
+        return self.distance_matrix[population, np.roll(population, -1, axis=1)].sum(axis=1, dtype=np.float64)
+
+    def run(self, on_progress=None, progress_interval=10):
+        # Solve and return (best_solution, best_distance), reporting Progress every `progress_interval` generations
+        self.start_clock()
+        rng = np.random.default_rng(random.randint(0, 2**32 - 1))
+        population = self.initial_population(rng)
+        lengths = self.tour_lengths(population)
+        best_solution = None
+        best_distance = float("inf")
+
+        self.stop_reason, stagnant = "generations", 0
+        for generation in range(self.generations):
+            if self.stopped(best_distance, stagnant):
+                break
+            # Evolve the population
+            population, lengths = self.evolve(population, lengths, rng)
+
+            # Update global best if the current generation found a shorter tour
+            current = int(np.argmin(lengths))
+            stagnant += 1
+            if lengths[current] < best_distance:
+                best_solution = population[current].tolist()
+                best_distance = float(lengths[current])
+                stagnant = 0
+            self.iterations_run = generation + 1
+
+            if on_progress is not None and generation % progress_interval == 0:
+                # A copy, as EAX replaces tours in place while the UI thread may still be drawing these
+                on_progress(Progress("GA", generation, best_solution, best_distance, self.elapsed(),
+                                     population.copy()))
+
+        return polish(best_solution, best_distance, self.distance_matrix, self.candidates, self.polish_time,
+                      self.control)
+
+    def initial_population(self, rng):
+        if self.eax:
+            return self.local_optima(rng)
+        return np.argsort(rng.random((self.population_size, self.num_cities)), axis=1).astype(np.int32)
+
+    def evolve(self, population, lengths, rng):
+        # One generation with the configured operator; returns the new population and its lengths
+        if self.eax:
+            return self.evolve_eax(population, lengths, rng)
+        return self.evolve_population(population, lengths, rng)
+
+    def evolve_population(self, population, lengths, rng):
+        # Breed a new population from the 10 shortest tours and return it with its lengths
+        def mutate(tour):
+            # Reverse the stretch that makes a random city adjacent to one of its nearest neighbours
+            i = int(rng.integers(len(tour)))
+            j = int(np.flatnonzero(tour == rng.choice(self.candidates[tour[i]]))[0])
+            i, j = sorted((i, j))
+            tour[i + 1:j + 1] = tour[i + 1:j + 1][::-1]
+
+        num_selected = min(10, len(population))
+        selected = population[np.argpartition(lengths, num_selected - 1)[:num_selected]]
+
+        # Two different parents per child
+        first = rng.integers(0, num_selected, size=len(population))
+        second = (first + rng.integers(1, max(num_selected, 2), size=len(population))) % num_selected
+        children = self.crossover(selected[first], selected[second], rng)
+
+        for c in np.flatnonzero(rng.random(len(children)) < 0.01):
+            mutate(children[c]) # Rows are views, so the child is reversed in place
+        if self.local_search:
+            for c in range(len(children)):
+                children[c] = local_search(children[c], *self.search_tables(self.candidates))
+
+        return children, self.tour_lengths(children)
+
+    def local_optima(self, rng):
+        # EAX starts from 2-opt / Or-opt optimised nearest-neighbour tours from random cities
+        starts = rng.choice(self.num_cities, size=self.population_size, replace=self.population_size > self.num_cities)
+        return np.array([local_search(candidate_tour(self.distance_matrix, self.candidates, int(start)),
+                                      *self.search_tables(self.candidates)) for start in starts], dtype=np.int32)
+
+    def evolve_eax(self, population, lengths, rng):
+        # EAX generation: parents are paired around a random ring and each is replaced by its best child
+        order = rng.permutation(len(population))
+        for i, a in enumerate(order):
+            b = order[(i + 1) % len(order)]
+            child, _ = edge_assembly_crossover(population[a], population[b], self.distance_matrix, self.candidates,
+                                               rng, eax_children)
+            if child is not None:
+                population[a] = child
+        return population, self.tour_lengths(population)
+
+def _island_task(spec, index, cancelled, running, barrier, lock):
+    # Runs in its own process: one GA population that publishes its best tour and trades migrants, all
+    #   through shared memory blocks named in spec
+    blocks = {key: shared_memory.SharedMemory(name=name) for key, name in spec["blocks"].items()}
+    try:
+        _island_loop(spec, index, blocks, cancelled, running, barrier, lock)
+    finally:
+        barrier.abort() # Islands still waiting to migrate carry on alone
+        for block in blocks.values():
+            try:
+                block.close()
+            except BufferError: # A traceback still holds a view; the process is ending anyway
+                pass
+
+def _island_loop(spec, index, blocks, cancelled, running, barrier, lock):
+    n, islands, migrants = spec["num_cities"], spec["islands"], spec["migrants"]
+    def view(key, shape, dtype):
+        return np.ndarray(shape, dtype=dtype, buffer=blocks[key].buf)
+
+    distances = spec["distances"]
+    if distances is None:
+        distances = view("distances", (n, n), spec["distance_dtype"])
+    candidates = view("candidates", spec["candidate_shape"], np.int32)
+    best_tours = view("best_tours", (islands, n), np.int32)
+    best_lengths = view("best_lengths", (islands,), np.float64)
+    generations_done = view("generations", (islands,), np.int64)
+    outbox = view("outbox", (islands, migrants, n), np.int32)
+    outbox_lengths = view("outbox_lengths", (islands, migrants), np.float64)
+
+    ga = GeneticAlgorithm(distances, candidates, spec["population_size"], spec["generations"], spec["local_search"],
+                          crossover=spec["crossover"])
+    rng = np.random.default_rng(spec["seed"] + index)
+    population = ga.initial_population(rng)
+    lengths = ga.tour_lengths(population)
+    best = float("inf")
+    for generation in range(spec["generations"]):
+        running.wait()
+        if cancelled.is_set():
+            break
+        population, lengths = ga.evolve(population, lengths, rng)
+        current = int(np.argmin(lengths))
+        if lengths[current] < best:
+            best = float(lengths[current])
+            with lock:
+                best_tours[index] = population[current]
+                best_lengths[index] = best
+        generations_done[index] = generation + 1
+
+        if islands > 1 and (generation + 1) % spec["interval"] == 0 and not barrier.broken:
+            # Post our best tours, wait for every island to post, take the source island's, then wait again so
+            #   no island overwrites its outbox before the others have read it
+            m = min(migrants, len(population))
+            top = np.argpartition(lengths, m - 1)[:m]
+            outbox[index, :m] = population[top]
+            outbox_lengths[index, :m] = lengths[top]
+            if spec["topology"] == "ring":
+                source = (index - 1) % islands
+            else: # A fresh random ring every migration, the same on every island
+                order = np.random.default_rng(spec["seed"] + generation).permutation(islands).tolist()
+                source = order[order.index(index) - 1]
+            try:
+                barrier.wait()
+                incoming = outbox[source, :m].copy()
+                incoming_lengths = outbox_lengths[source, :m].copy()
+                barrier.wait()
+            except threading.BrokenBarrierError:
+                continue
+            worst = np.argpartition(lengths, len(lengths) - m)[-m:]
+            population[worst] = incoming
+            lengths[worst] = incoming_lengths
+
+class IslandModel(Solver):
+    """Several GA populations in separate processes, trading their best tours every few generations."""
+    def __init__(self, distance_matrix, candidates=None, islands=None, population_size=population_size,
+                 generations=generations, local_search=False, time_limit=None, control=None, crossover="OX",
+                 interval=migration_interval, migrants=num_migrants, topology="ring", polish_time=None,
+                 lower_bound=None, target_gap=None, target_distance=None, stagnation=None):
+        self.distance_matrix = distance_matrix
+        self.num_cities = len(distance_matrix)
+        self.candidates = candidates if candidates is not None else nearest_neighbours(distance_matrix)
+        self.islands = islands or cpu_count()
+        self.population_size = population_size
+        self.generations = generations
+        self.local_search = local_search
+        self.time_limit = time_limit
+        self.control = control
+        self.polish_time = polish_time
+        self.lower_bound = lower_bound
+        self.target_gap = target_gap
+        self.target_distance = target_distance
+        self.stagnation = stagnation # Generations of the slowest island without a shorter tour
+        self.stop_reason = None
+        self.crossover = crossover
+        self.interval = interval
+        self.migrants = migrants
+        self.topology = topology
+        self.start_time = None
+        self.iterations_run = 0 # Generations summed over all islands
+
+    def run(self, on_progress=None, progress_interval=10, poll_interval=0.1):
+        # Start the islands and watch their published bests; returns (best_solution, best_distance)
+        self.start_clock()
+        n, islands = self.num_cities, self.islands
+        shared = {
+            "candidates": np.ascontiguousarray(self.candidates, dtype=np.int32),
+            "best_tours": np.zeros((islands, n), dtype=np.int32),
+            "best_lengths": np.full(islands, np.inf),
+            "generations": np.zeros(islands, dtype=np.int64),
+            "outbox": np.zeros((islands, self.migrants, n), dtype=np.int32),
+            "outbox_lengths": np.zeros((islands, self.migrants)),
+        }
+        lazy = not isinstance(self.distance_matrix, np.ndarray)
+        if not lazy:
+            shared["distances"] = np.asarray(self.distance_matrix)
+
+        resource_tracker.ensure_running() # Islands must share our tracker, like the colony pool
+        blocks, views = {}, {}
+        for key, array in shared.items():
+            blocks[key], views[key] = _share(array)
+        del shared
+        spec = {"blocks": {key: block.name for key, block in blocks.items()}, "num_cities": n, "islands": islands,
+                "migrants": self.migrants, "distances": self.distance_matrix if lazy else None,
+                "distance_dtype": views["distances"].dtype if not lazy else None,
+                "candidate_shape": views["candidates"].shape, "population_size": self.population_size,
+                "generations": self.generations, "local_search": self.local_search, "crossover": self.crossover,
+                "interval": self.interval, "topology": self.topology, "seed": random.randint(0, 2**31 - 1)}
+
+        cancelled, running, barrier = Event(), Event(), Barrier(islands)
+        running.set()
+        locks = [Lock() for _ in range(islands)]
+        processes = [Process(target=_island_task, args=(spec, i, cancelled, running, barrier, locks[i]), daemon=True)
+                     for i in range(islands)]
+        best_solution, best_distance = None, float("inf")
+        reported = -1
+        improved_at = generation = 0 # Slowest island's generation at the last improvement, and now
+        self.stop_reason = "generations"
+        try:
+            for process in processes:
+                process.start()
+            while any(process.is_alive() for process in processes):
+                if self.control is not None and self.control.paused():
+                    running.clear() # Islands stop at their next generation while we wait for resume
+                    self.control.proceed()
+                    running.set()
+                reason = _stop_reason(self, best_distance, generation - improved_at)
+                if self.control is not None and self.control.cancelled.is_set():
+                    reason = "cancelled"
+                if reason is not None and not cancelled.is_set():
+                    self.stop_reason = reason
+                    cancelled.set()
+                    running.set()
+                alive = next((process for process in processes if process.is_alive()), None)
+                if alive is not None: # The last island may have exited since the loop condition was checked
+                    alive.join(poll_interval)
+
+                previous = best_distance
+                best_solution, best_distance, tours = self.snapshot(views, locks)
+                generation = int(views["generations"].min())
+                if best_distance < previous:
+                    improved_at = generation
+                self.iterations_run = int(views["generations"].sum())
+                if on_progress is not None and best_solution is not None and generation // progress_interval > reported:
+                    reported = generation // progress_interval
+                    on_progress(Progress("GA", generation, best_solution, best_distance, self.elapsed(), tours))
+
+            best_solution, best_distance, _ = self.snapshot(views, locks)
+            self.iterations_run = int(views["generations"].sum())
+        finally:
+            cancelled.set()
+            running.set()
+            for process in processes:
+                process.join(1.0)
+                if process.is_alive():
+                    process.terminate()
+            views.clear()
+            for block in blocks.values():
+                block.close()
+                block.unlink()
+        return polish(best_solution, best_distance, self.distance_matrix, self.candidates, self.polish_time,
+                      self.control)
+
+    def snapshot(self, views, locks):
+        # Copy every island's published best under its lock; returns the global best and the islands' bests
+        tours, lengths = [], []
+        for i, lock in enumerate(locks):
+            with lock:
+                if np.isfinite(views["best_lengths"][i]):
+                    tours.append(views["best_tours"][i].copy())
+                    lengths.append(float(views["best_lengths"][i]))
+        if not tours:
+            return None, float("inf"), ()
+        best = int(np.argmin(lengths))
+        return tours[best].tolist(), lengths[best], np.array(tours)
+
+def solve(coordinates, solver, iterations=iterations, time_limit=None, local_search=False, pheromone_rule="AS",
+          on_progress=None, distances=None, lazy=None, crossover="OX", islands=0, polish_time=None, bound=False,
+          target_gap=None, target_distance=None, stagnation=None):
+    # Solve one instance with "aco", "ga", "lk" or "exact" and return the tour plus metrics as a JSON-ready dict;
+    #   `distances` overrides the Euclidean matrix, e.g. with a TSPLIB instance's own distance function.
+    #   lazy=None computes distances on the fly only for instances above dense_limit cities. bound=True (or a
+    #   target_gap) adds the Held-Karp lower bound; ACO and GA stop once within target_gap percent of it, at
+    #   target_distance, or after `stagnation` iterations without improvement
+    if iterations < 1:
+        raise ValueError(f"Need at least one iteration, got {iterations}")
+    if distances is None:
+        coordinates = np.asarray(coordinates, dtype=np.float64)
+        if lazy is None:
+            lazy = len(coordinates) > dense_limit
+        distances = LazyDistanceMatrix(coordinates) if lazy else distance_matrix(coordinates)
+        candidates = NeighbourIndex(coordinates).neighbours
+    else:
+        candidates = nearest_neighbours(distances)
+    lower_bound = instance_bound(distances, candidates) if bound or target_gap is not None else None
+    stops = {"lower_bound": lower_bound, "target_gap": target_gap, "target_distance": target_distance,
+             "stagnation": stagnation}
+    start_time = time.time()
+    if solver == "exact" and len(distances) > exact_limit:
+        raise ValueError(f"The exact solver handles at most {exact_limit} cities, got {len(distances)}")
+    if solver == "aco":
+        engine = ACO(distances, num_ants=50, alpha=alpha, beta=beta, evaporation_rate=evaporation_rate,
+                     iterations=iterations, candidates=candidates, local_search=local_search,
+                     pheromone_rule=pheromone_rule, time_limit=time_limit, polish_time=polish_time, **stops)
+        best_tour, best_distance, _ = engine.run(on_progress)
+    elif solver == "ga" and islands:
+        engine = IslandModel(distances, candidates, islands, generations=iterations, local_search=local_search,
+                             time_limit=time_limit, crossover=crossover, polish_time=polish_time, **stops)
+        best_tour, best_distance = engine.run(on_progress)
+    elif solver == "ga":
+        engine = GeneticAlgorithm(distances, candidates, generations=iterations, local_search=local_search,
+                                  time_limit=time_limit, crossover=crossover, polish_time=polish_time, **stops)
+        best_tour, best_distance = engine.run(on_progress)
+    elif solver == "lk":
+        engine = LinKernighan(distances, candidates, time_limit=time_limit or lk_time_limit)
+        best_tour, best_distance = engine.run(on_progress)
+    elif solver == "exact":
+        engine = ExactSolver(distances)
+        best_tour, best_distance = engine.run(on_progress)
+    else:
+        raise ValueError(f"Unknown solver: {solver}")
+    elapsed = time.time() - start_time
+
+    return {
+        "solver": solver,
+        "cities": len(distances),
+        "best_distance": float(best_distance),
+        "tour": [int(city) for city in best_tour],
+        "iterations": engine.iterations_run,
+        "time": elapsed,
+        "iterations_per_second": engine.iterations_run / max(elapsed, 1e-9),
+        "stop_reason": engine.stop_reason,
+        "lower_bound": lower_bound,
+        "bound_gap": tsplib.gap(best_distance, lower_bound),
+    }
+
+def batch_instances(cities, seeds, tsplib_paths=(), lazy=None, oracle=False):
+    # (name, seed, coordinates, distances, known optimum) for every solve of a batch: one per seed and TSPLIB
+    #   file, or per seed and city count. oracle=True fills in the exact optimum of small random instances
+    if tsplib_paths:
+        instances = []
+        for path in tsplib_paths:
+            problem = tsplib.read_tsplib(path)
+            distances = instance_distances(problem, lazy or problem.dimension > dense_limit)
+            instances.extend((problem.name, seed, problem.coordinates, distances, problem.optimum) for seed in seeds)
+    else:
+        instances = [(f"random{num}", seed, random_coordinates(num, seed), None, None)
+                     for num in cities for seed in seeds]
+    if oracle: # Small instances without a published optimum get an exact one, so their gaps are meaningful
+        for k, (name, seed, coordinates, distances, optimum) in enumerate(instances):
+            matrix = distance_matrix(coordinates) if distances is None else distances
+            if optimum is None and len(matrix) <= exact_limit:
+                instances[k] = (name, seed, coordinates, distances, held_karp(matrix)[1])
+    return instances
+
+def oversized_for_exact(instances):
+    # Names of batch instances too large for the exact solver, so a batch can refuse them before solving any
+    return sorted({name for name, _, coordinates, distances, _ in instances
+                   if len(distances if distances is not None else coordinates) > exact_limit})
+
+def positive(kind):
+    # argparse type for budgets and thresholds that must be above zero
+    def parse(value):
+        number = kind(value)
+        if number <= 0:
+            raise argparse.ArgumentTypeError(f"must be positive, got {value}")
+        return number
+    return parse
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve batches of random TSP instances without the UI.")
+    parser.add_argument("--cities", type=int, nargs="+", default=[100], help="city counts to generate")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0], help="one instance per seed and city count")
+    parser.add_argument("--tsplib", nargs="+", default=[], help="TSPLIB .tsp files to solve instead of random ones")
+    parser.add_argument("--solver", choices=("aco", "ga", "lk", "exact"), nargs="+", default=["aco"])
+    parser.add_argument("--iterations", type=positive(int), default=iterations, help="iteration / generation budget")
+    parser.add_argument("--time-limit", type=positive(float), default=None, help="wall-clock budget per solve, in seconds")
+    parser.add_argument("--rule", choices=pheromone_rules, default="AS", help="ACO pheromone rule")
+    parser.add_argument("--crossover", choices=crossover_names, default="OX", help="GA crossover operator")
+    parser.add_argument("--islands", type=int, default=0,
+                        help="run the GA as this many island populations in separate processes")
+    parser.add_argument("--local-search", action="store_true", help="polish tours with 2-opt / Or-opt")
+    parser.add_argument("--polish", type=float, default=None, metavar="SECONDS",
+                        help="finish ACO / GA tours with this many seconds of chained Lin-Kernighan")
+    parser.add_argument("--bound", action="store_true", help="report the gap to the Held-Karp lower bound")
+    parser.add_argument("--stop-gap", type=float, default=None, metavar="PERCENT",
+                        help="stop ACO / GA once the tour is within this many percent of the lower bound")
+    parser.add_argument("--target", type=float, default=None, metavar="DISTANCE",
+                        help="stop ACO / GA once a tour this short is found")
+    parser.add_argument("--stagnation", type=positive(int), default=None, metavar="K",
+                        help="stop ACO / GA after K iterations without a shorter tour")
+    parser.add_argument("--oracle", action="store_true",
+                        help=f"fill in the optimum of instances up to {exact_limit} cities with the exact solver")
+    parser.add_argument("--lazy", action="store_true", default=None,
+                        help="compute distances on the fly instead of storing the N x N matrix")
+    parser.add_argument("--output", default="-", help="JSON file to write, '-' for stdout")
+    args = parser.parse_args(argv)
+
+    instances = batch_instances(args.cities, args.seeds, args.tsplib, args.lazy, args.oracle)
+    too_large = oversized_for_exact(instances) if "exact" in args.solver else []
+    if too_large:
+        parser.error(f"--solver exact handles at most {exact_limit} cities; too large: {', '.join(too_large)}")
+
+    results = []
+    for name, seed, coordinates, distances, optimum in instances:
+        for solver in args.solver:
+            random.seed(seed)
+            result = solve(coordinates, solver, args.iterations, args.time_limit, args.local_search, args.rule,
+                           distances=distances, lazy=args.lazy, crossover=args.crossover, islands=args.islands,
+                           polish_time=args.polish, bound=args.bound, target_gap=args.stop_gap,
+                           target_distance=args.target, stagnation=args.stagnation)
+            result.update(instance=name, seed=seed, optimum=optimum, gap=tsplib.gap(result["best_distance"], optimum))
+            results.append(result)
+            logging.info(f"{solver} on {name} (seed {seed}): {result['best_distance']:.2f} in {result['time']:.2f}s, "
+                         f"stopped on {result['stop_reason']}")
+
+    if args.output == "-":
+        print(json.dumps(results, indent=2))
+    else:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,255 @@
+"""TSPLIB instance reader and writer.
+
+Reads NODE_COORD_SECTION instances (EUC_2D, CEIL_2D, ATT, GEO) and EXPLICIT edge-weight matrices into
+contiguous NumPy arrays. The parsed arrays are cached next to the source file as .npy and reopened
+memory-mapped, so large instances only pay for parsing once.
+"""
+import itertools
+import json
+import os
+
+import numpy as np
+
+# Published optimal tour lengths for common TSPLIB instances
+known_optima = {
+    "att48": 10628, "bays29": 2020, "berlin52": 7542, "ch130": 6110, "ch150": 6528, "d198": 15780,
+    "dantzig42": 699, "eil51": 426, "eil76": 538, "eil101": 629, "fri26": 937, "gr17": 2085, "gr24": 1272,
+    "kroA100": 21282, "kroB100": 22141, "kroC100": 20749, "kroD100": 21294, "kroE100": 22068,
+    "lin105": 14379, "lin318": 42029, "pcb442": 50778, "pr76": 108159, "pr1002": 259045, "pr2392": 378032,
+    "rat99": 1211, "rat783": 8806, "rd100": 7910, "st70": 675, "a280": 2579, "tsp225": 3916,
+    "u574": 36905, "ulysses16": 6859, "ulysses22": 7013,
+}
+
+coordinate_types = ("EUC_2D", "CEIL_2D", "ATT", "GEO")
+
+class TSPInstance:
+    """A parsed TSPLIB problem: header fields plus coordinates and/or an explicit weight matrix."""
+    def __init__(self, name, dimension, edge_weight_type, coordinates=None, weights=None, comment=""):
+        self.name = name
+        self.dimension = dimension
+        self.edge_weight_type = edge_weight_type
+        self.coordinates = coordinates # (N, 2) float64, possibly memory-mapped
+        self.weights = weights # (N, N) explicit matrix for EXPLICIT instances
+        self.comment = comment
+        self.optimum = known_optima.get(name)
+
+    def metric(self, a, b):
+        # Elementwise distance between broadcastable (..., 2) coordinate arrays of this instance
+        return tsplib_distances(a, b, self.edge_weight_type)
+
+def tsplib_distances(a, b, edge_weight_type):
+    # TSPLIB distance functions between broadcastable (..., 2) coordinate arrays, rounded the way the
+    #   published optima were computed
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    if edge_weight_type == "GEO":
+        # DDD.MM coordinates to radians, then great-circle distance on the TSPLIB reference sphere
+        lat_a, lon_a = _geo_radians(a[..., 0]), _geo_radians(a[..., 1])
+        lat_b, lon_b = _geo_radians(b[..., 0]), _geo_radians(b[..., 1])
+        q1 = np.cos(lon_a - lon_b)
+        q2 = np.cos(lat_a - lat_b)
+        q3 = np.cos(lat_a + lat_b)
+        cosine = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+        distances = np.floor(6378.388 * np.arccos(cosine) + 1.0)
+        return np.where((a == b).all(axis=-1), 0.0, distances) # The formula gives 1, not 0, for a city to itself
+
+    squared = ((a - b) ** 2).sum(axis=-1)
+    if edge_weight_type == "EUC_2D":
+        return np.floor(np.sqrt(squared) + 0.5)
+    if edge_weight_type == "CEIL_2D":
+        return np.ceil(np.sqrt(squared))
+    if edge_weight_type == "ATT":
+        pseudo = np.sqrt(squared / 10.0)
+        rounded = np.floor(pseudo + 0.5)
+        return np.where(rounded < pseudo, rounded + 1.0, rounded)
+    raise ValueError(f"Unsupported EDGE_WEIGHT_TYPE: {edge_weight_type}")
+
+def _geo_radians(values):
+    degrees = np.trunc(values)
+    return 3.141592 * (degrees + 5.0 * (values - degrees) / 3.0) / 180.0
+
+def _cache_paths(path):
+    return path + ".meta.json", path + ".coords.npy", path + ".weights.npy"
+
+def _load_cache(path):
+    # Reopen a previous parse if it is newer than the source file
+    meta_path, coords_path, weights_path = _cache_paths(path)
+    if not os.path.exists(meta_path) or os.path.getmtime(meta_path) < os.path.getmtime(path):
+        return None
+    with open(meta_path) as f:
+        meta = json.load(f)
+    coordinates = np.load(coords_path, mmap_mode="r") if meta["has_coordinates"] else None
+    weights = np.load(weights_path, mmap_mode="r") if meta["has_weights"] else None
+    return TSPInstance(meta["name"], meta["dimension"], meta["edge_weight_type"], coordinates, weights,
+                       meta["comment"])
+
+def _save_cache(path, instance):
+    meta_path, coords_path, weights_path = _cache_paths(path)
+    try:
+        if instance.coordinates is not None:
+            np.save(coords_path, instance.coordinates)
+        if instance.weights is not None:
+            np.save(weights_path, instance.weights)
+        with open(meta_path, "w") as f: # Written last so a partial cache is never picked up
+            json.dump({"name": instance.name, "dimension": instance.dimension,
+                       "edge_weight_type": instance.edge_weight_type, "comment": instance.comment,
+                       "has_coordinates": instance.coordinates is not None,
+                       "has_weights": instance.weights is not None}, f)
+    except OSError: # Read-only location: the instance still loads, just without a cache
+        pass
+
+def _read_numbers(lines, count):
+    # Pull `count` whitespace-separated numbers off a line iterator, however they are wrapped
+    values = []
+    while len(values) < count:
+        line = next(lines, None)
+        if line is None:
+            raise ValueError("Unexpected end of file in data section")
+        values.extend(line.split())
+    return np.array(values[:count], dtype=np.float64)
+
+def _expand_weights(values, dimension, edge_weight_format):
+    # Turn an EDGE_WEIGHT_SECTION in any of the TSPLIB layouts into a full symmetric matrix
+    n = dimension
+    if edge_weight_format == "FULL_MATRIX":
+        return values.reshape(n, n)
+    # Column-wise layouts are the row-wise layouts of the other triangle
+    edge_weight_format = {"UPPER_COL": "LOWER_ROW", "LOWER_COL": "UPPER_ROW", "UPPER_DIAG_COL": "LOWER_DIAG_ROW",
+                          "LOWER_DIAG_COL": "UPPER_DIAG_ROW"}.get(edge_weight_format, edge_weight_format)
+    diagonal = "DIAG" in edge_weight_format
+    if edge_weight_format.startswith("UPPER"):
+        rows, cols = np.triu_indices(n, 0 if diagonal else 1)
+    elif edge_weight_format.startswith("LOWER"):
+        rows, cols = np.tril_indices(n, 0 if diagonal else -1)
+    else:
+        raise ValueError(f"Unsupported EDGE_WEIGHT_FORMAT: {edge_weight_format}")
+    matrix = np.zeros((n, n), dtype=np.float64)
+    matrix[rows, cols] = values
+    matrix[cols, rows] = values
+    return matrix
+
+def _weight_count(dimension, edge_weight_format):
+    n = dimension
+    if edge_weight_format == "FULL_MATRIX":
+        return n * n
+    return n * (n + 1) // 2 if "DIAG" in edge_weight_format else n * (n - 1) // 2
+
+def read_tsplib(path, cache=True):
+    # Parse a .tsp file in one streaming pass; with cache=True the arrays are reused memory-mapped next time
+    if cache:
+        instance = _load_cache(path)
+        if instance is not None:
+            return instance
+
+    header = {}
+    coordinates = display = weights = None
+    with open(path) as f:
+        lines = iter(f)
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            keyword = line.split(":")[0].strip().upper()
+            if keyword == "EOF":
+                break
+            if keyword in ("NODE_COORD_SECTION", "DISPLAY_DATA_SECTION"):
+                dimension = int(header["DIMENSION"])
+                # "index x y" per city; a block of lines at a time is much faster than line-by-line parsing
+                block = " ".join(itertools.islice(lines, dimension)).split()
+                table = np.array(block, dtype=np.float64).reshape(dimension, -1)
+                points = np.ascontiguousarray(table[np.argsort(table[:, 0], kind="stable"), 1:3])
+                if keyword == "NODE_COORD_SECTION":
+                    coordinates = points
+                else:
+                    display = points
+            elif keyword == "EDGE_WEIGHT_SECTION":
+                dimension = int(header["DIMENSION"])
+                edge_weight_format = header.get("EDGE_WEIGHT_FORMAT", "FULL_MATRIX").upper()
+                values = _read_numbers(lines, _weight_count(dimension, edge_weight_format))
+                weights = _expand_weights(values, dimension, edge_weight_format)
+            elif ":" in line:
+                key, value = line.split(":", 1)
+                header[key.strip().upper()] = value.strip()
+            elif keyword.endswith("_SECTION"): # Sections we do not use (FIXED_EDGES, DEMAND, ...) end with -1
+                for skipped in lines:
+                    if skipped.strip() == "-1":
+                        break
+
+    edge_weight_type = header.get("EDGE_WEIGHT_TYPE", "EUC_2D").upper()
+    if edge_weight_type == "EXPLICIT":
+        coordinates = display if coordinates is None else coordinates
+        if weights is None:
+            raise ValueError(f"{path}: EXPLICIT instance without EDGE_WEIGHT_SECTION")
+    elif edge_weight_type not in coordinate_types:
+        raise ValueError(f"{path}: unsupported EDGE_WEIGHT_TYPE {edge_weight_type}")
+    elif coordinates is None:
+        raise ValueError(f"{path}: missing NODE_COORD_SECTION")
+
+    name = header.get("NAME", os.path.splitext(os.path.basename(path))[0])
+    instance = TSPInstance(name, int(header["DIMENSION"]), edge_weight_type, coordinates, weights,
+                           header.get("COMMENT", ""))
+    if cache:
+        _save_cache(path, instance)
+    return instance
+
+def _coordinate(value):
+    # Exact text for a coordinate: integers as written in most TSPLIB files, anything else at full precision
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+def write_tsplib(path, coordinates, name="instance", comment="", edge_weight_type="EUC_2D"):
+    # Write coordinates as a NODE_COORD_SECTION instance
+    coordinates = np.asarray(coordinates, dtype=np.float64)
+    with open(path, "w") as f:
+        f.write(f"NAME : {name}\n")
+        if comment:
+            f.write(f"COMMENT : {comment}\n")
+        f.write("TYPE : TSP\n")
+        f.write(f"DIMENSION : {len(coordinates)}\n")
+        f.write(f"EDGE_WEIGHT_TYPE : {edge_weight_type}\n")
+        f.write("NODE_COORD_SECTION\n")
+        f.writelines(f"{i + 1} {_coordinate(x)} {_coordinate(y)}\n" for i, (x, y) in enumerate(coordinates))
+        f.write("EOF\n")
+
+def write_tour(path, tour, name="tour", length=None):
+    # Write a tour in TSPLIB .tour format (1-based cities, terminated by -1)
+    with open(path, "w") as f:
+        f.write(f"NAME : {name}\n")
+        if length is not None:
+            f.write(f"COMMENT : Length {length:g}\n")
+        f.write("TYPE : TOUR\n")
+        f.write(f"DIMENSION : {len(tour)}\n")
+        f.write("TOUR_SECTION\n")
+        f.writelines(f"{int(city) + 1}\n" for city in tour)
+        f.write("-1\nEOF\n")
+
+def read_tour(path):
+    # Read a TSPLIB .tour file back into a list of 0-based cities
+    tour = []
+    with open(path) as f:
+        in_section = False
+        for line in f:
+            line = line.strip()
+            if line.upper().startswith("TOUR_SECTION"):
+                in_section = True
+            elif in_section:
+                for token in line.split():
+                    if int(token) == -1:
+                        return tour
+                    tour.append(int(token) - 1)
+    return tour
+
+def tour_length(tour, distances):
+    return float(distances[tour, np.roll(tour, -1)].sum(dtype=np.float64))
+
+def gap(length, optimum):
+    # Percentage above a known optimum, or None when there is none
+    if not optimum:
+        return None
+    return 100.0 * (length - optimum) / optimum
+
+if __name__ == '__main__':
+    import sys
+    for file_path in sys.argv[1:]:
+        problem = read_tsplib(file_path)
+        print(f"{problem.name}: {problem.dimension} cities, {problem.edge_weight_type}, optimum {problem.optimum}")